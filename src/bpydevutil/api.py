@@ -0,0 +1,237 @@
+"""In-process batch API for build tools, returns structured results and never prints."""
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+import typer
+
+from bpydevutil.functions import common_funcs, install_funcs, pack_funcs, symlink_funcs, vendor_funcs
+
+OPERATIONS = ("install", "symlink", "pack")
+
+
+@dataclass
+class Job:
+    """A single install, symlink or pack operation over every addon in a sources directory."""
+
+    operation: str
+    src_dir: Path
+    target_dir: Path
+    excluded_addons: list[str] = field(default_factory=list)
+    remove_suffixes: Optional[list[str]] = None
+    reproducible: bool = False
+    vendor: Optional[vendor_funcs.VendorWheels] = None
+    label: Optional[str] = None  # Free text for callers to identify the job by.
+
+    def __post_init__(self) -> None:
+        self.src_dir = Path(self.src_dir)
+        self.target_dir = Path(self.target_dir)
+
+
+@dataclass
+class AddonResult:
+    """Outcome of processing a single addon."""
+
+    addon: str
+    src: Path
+    success: bool = False
+    duration: float = 0.0
+    files: int = 0
+    bytes: int = 0
+    output: Optional[Path] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class JobResult:
+    """Outcome of a job and each of its addons."""
+
+    job: Job
+    addons: list[AddonResult] = field(default_factory=list)
+    skipped: list[str] = field(default_factory=list)  # Addons already handled by an earlier job in the batch.
+    duration: float = 0.0  # Summed across addons, which may have run concurrently.
+    error: Optional[str] = None
+
+    @property
+    def success(self) -> bool:
+        """The job and every one of its addons succeeded."""
+        return self.error is None and all(addon.success for addon in self.addons)
+
+    @property
+    def files(self) -> int:
+        """Total files processed across all addons."""
+        return sum(addon.files for addon in self.addons)
+
+    @property
+    def bytes(self) -> int:
+        """Total bytes processed across all addons."""
+        return sum(addon.bytes for addon in self.addons)
+
+
+def _install(job: Job, addon_path: Path, result: AddonResult) -> None:
+    """Replace the installed copy of an addon with its sources."""
+    common_funcs.clear_old_addon(job.target_dir, addon_path.name)
+    install_funcs.InstallAddonsFromSource(job.target_dir).install_addon(addon_path)
+
+    result.files = common_funcs.count_files(addon_path)
+    result.bytes = pack_funcs.PackAddonsFromSource.get_pack_size(addon_path)
+
+    if job.vendor:
+        vendored_files = job.vendor.get_vendored_files(addon_path)
+        if vendored_files:
+            job.vendor.link_into(job.target_dir / addon_path.name, vendored_files)
+            result.files += len(vendored_files)
+            result.bytes += sum(path.stat().st_size for path in vendored_files.values())
+    result.output = job.target_dir / addon_path.name
+
+
+def _symlink(job: Job, addon_path: Path, result: AddonResult) -> None:
+    """Link an addon into the addons directory unless an up-to-date link exists."""
+    reconciled = symlink_funcs.SymlinkToAddonSource(job.target_dir).reconcile([addon_path])
+
+    result.files = len(reconciled.created) + len(reconciled.replaced)
+    result.output = job.target_dir / addon_path.name
+
+
+def _pack(job: Job, addon_path: Path, result: AddonResult) -> None:
+    """Pack an addon into a release ZIP file named from its bl_info."""
+    packing_tool = pack_funcs.PackAddonsFromSource(job.target_dir)
+
+    bl_info = packing_tool.get_addon_data(addon_path) or {}
+    missing = [k for k in ("name", "version") if k not in bl_info]
+    if missing:
+        raise ValueError(f"<{', '.join(missing)}> missing from the addon bl_info dictionary.")
+
+    name = packing_tool.generate_zip_name(bl_info)
+    vendored_files = job.vendor.get_vendored_files(addon_path) if job.vendor else {}
+    common_funcs.clear_unused_files(addon_path, job.remove_suffixes)
+    packing_tool.pack_addon(
+        addon_path,
+        name,
+        job.src_dir,
+        lambda n: setattr(result, "bytes", result.bytes + n),
+        job.reproducible,
+        vendored_files,
+    )
+
+    result.files = common_funcs.count_files(addon_path) + len(vendored_files)
+    result.output = job.target_dir / f"{name}.zip"
+
+
+_RUNNERS = {"install": _install, "symlink": _symlink, "pack": _pack}
+
+
+def _run_addon(job: Job, addon_path: Path) -> AddonResult:
+    """Run a job for one addon, capturing timings and errors."""
+    result = AddonResult(addon_path.name, addon_path)
+    start = time.perf_counter()
+
+    try:
+        _RUNNERS[job.operation](job, addon_path, result)
+        result.success = True
+    except Exception as e:
+        result.error = f"{type(e).__name__}: {e}"
+
+    result.duration = time.perf_counter() - start
+    return result
+
+
+def _validate(job: Job) -> Optional[str]:
+    """Check a job can run.
+
+    Returns:
+        The error message, None if the job is valid.
+    """
+    if job.operation not in OPERATIONS:
+        return f"Unknown operation <{job.operation}>, expected one of {', '.join(OPERATIONS)}."
+
+    for param, directory in {"src-dir": job.src_dir, "target-dir": job.target_dir}.items():
+        if not Path(directory).is_dir():
+            return f"<{param}> <{directory}> is not an existing directory."
+
+    return None
+
+
+def _target_name(job: Job, addon_path: Path) -> str:
+    """Get the name an addon takes inside the job target, the release ZIP name when packing."""
+    if job.operation == "pack":
+        bl_info = pack_funcs.PackAddonsFromSource.get_addon_data(addon_path) or {}
+        # Addons without a name or version fail when packed, fall back to the module name until then.
+        if "name" in bl_info and "version" in bl_info:
+            return f"{pack_funcs.PackAddonsFromSource.generate_zip_name(bl_info)}.zip"
+
+    return addon_path.stem
+
+
+def run_jobs(jobs: list[Job], max_workers: Optional[int] = None) -> list[JobResult]:
+    """Run a batch of jobs, scheduling every addon of every job through one shared worker pool.
+
+    An addon which an earlier job already sends to the same target is skipped, a different addon
+    with the same name as one already sent to that target fails instead of overwriting it.
+    Packed addons are compared by the name of their release ZIP file, which comes from bl_info.
+
+    Args:
+        jobs: Jobs to run.
+        max_workers: Maximum number of addons processed at the same time, defaults to the executor default.
+
+    Returns:
+        One result per job, in the order the jobs were given.
+    """
+
+    results = []
+    futures = []
+    claimed = {}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for job in jobs:
+            job_result = JobResult(job, error=_validate(job))
+            results.append(job_result)
+            if job_result.error:
+                continue
+
+            try:
+                addon_srcs = common_funcs.get_addon_srcs(job.src_dir, job.excluded_addons, quiet=True)
+            except typer.Abort:
+                job_result.error = f"There are no addon sources inside the directory <{job.src_dir}>."
+                continue
+
+            addon_futures = []
+            for addon in addon_srcs:
+                try:
+                    key = (job.operation, job.target_dir.resolve(), _target_name(job, addon))
+                except Exception as e:
+                    addon_futures.append(AddonResult(addon.name, addon, error=f"{type(e).__name__}: {e}"))
+                    continue
+
+                if key not in claimed:
+                    claimed[key] = addon.resolve()
+                    addon_futures.append(executor.submit(_run_addon, job, addon))
+                elif claimed[key] == addon.resolve():
+                    job_result.skipped.append(addon.name)
+                else:
+                    error = f"Conflicts with <{claimed[key]}>, which is sent to the same target."
+                    addon_futures.append(AddonResult(addon.name, addon, error=error))
+
+            futures.append((job_result, addon_futures))
+
+        for job_result, addon_futures in futures:
+            job_result.addons = [
+                future if isinstance(future, AddonResult) else future.result() for future in addon_futures
+            ]
+            job_result.duration = sum(addon.duration for addon in job_result.addons)
+
+    return results
+
+
+def run_job(job: Job) -> JobResult:
+    """Run a single job.
+
+    Args:
+        job: The job to run.
+
+    Returns:
+        The job result.
+    """
+    return run_jobs([job])[0]
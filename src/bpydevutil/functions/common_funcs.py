@@ -1,6 +1,9 @@
 """Common functions used by multiple functions."""
+import os
 import shutil
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Optional, Union
 
@@ -8,6 +11,8 @@ import tomli
 import typer
 from rich import print
 
+CLEANUP_BATCH_SIZE = 256
+
 
 def load_blender(blender_exe: str, addons: list[str] = None) -> None:
     """Load Blender and automatically enable addons.
@@ -47,16 +52,65 @@ def clear_old_addon(addon_dir: Path, name: str) -> None:
         if Path(addon_path).with_suffix(".py").exists():
             addon_path = addon_path.with_suffix(".py")
 
-    if addon_path.is_dir():
-        if addon_path.is_symlink():
-            addon_path.rmdir()
-        else:
-            shutil.rmtree(addon_path)
-    else:
+    if addon_path.is_symlink():
         addon_path.unlink()
+    elif addon_path.is_dir():
+        shutil.rmtree(addon_path)
+    else:
+        addon_path.unlink(missing_ok=True)
+
+
+@dataclass
+class CleanupReport:
+    """Files and bytes reclaimed by garbage cleaning."""
+
+    files: int = 0
+    bytes: int = 0
+    paths: list[Path] = field(default_factory=list)
+
+
+def _measure_tree(root: str) -> tuple[int, int]:
+    """Count the files and bytes inside a directory without following symlinks.
+
+    Args:
+        root: The directory to measure.
+
+    Returns:
+        Number of files and their total size in bytes.
+    """
+    files, size = 0, 0
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                else:
+                    files += 1
+                    size += entry.stat(follow_symlinks=False).st_size
+
+    return files, size
 
 
-def clear_unused_files(addon: Path, rm_suffixes: set[str] = None) -> int:
+def _remove_batch(paths: list[str]) -> None:
+    """Delete a batch of files and directories, ignoring anything already gone.
+
+    Args:
+        paths: Paths to delete.
+    """
+    for path in paths:
+        try:
+            if os.path.isdir(path) and not os.path.islink(path):
+                shutil.rmtree(path)
+            else:
+                os.unlink(path)
+        except FileNotFoundError:
+            continue
+
+
+def clear_unused_files(
+    addon: Path, rm_suffixes: set[str] = None, dry_run: bool = False, max_workers: Optional[int] = None
+) -> CleanupReport:
     """
     Garbage cleaning source files.
     Removes the __pycache__ folder
@@ -65,31 +119,71 @@ def clear_unused_files(addon: Path, rm_suffixes: set[str] = None) -> int:
     Args:
         addon: Addon path to garbage clean.
         rm_suffixes: suffixes to search for (include '.').
+        dry_run: Only report what would be removed.
+        max_workers: Number of threads deleting files, defaults to the executor default.
 
     Returns
-        Number of files deleted.
+        Number of files and bytes deleted, and the paths matched.
     """
     if rm_suffixes is None:
         rm_suffixes = {".pyc"}
+    rm_suffixes = set(rm_suffixes)
+
+    report = CleanupReport()
+    if not addon.is_dir():
+        return report
+
+    # Single walk, matched __pycache__ folders are pruned rather than descended into.
+    stack = [str(addon)]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name == "__pycache__":
+                        files, size = _measure_tree(entry.path)
+                        report.files += files
+                        report.bytes += size
+                        report.paths.append(Path(entry.path))
+                    else:
+                        stack.append(entry.path)
+                elif os.path.splitext(entry.name)[1] in rm_suffixes:
+                    report.files += 1
+                    report.bytes += entry.stat(follow_symlinks=False).st_size
+                    report.paths.append(Path(entry.path))
+
+    if dry_run or not report.paths:
+        return report
+
+    paths = [str(path) for path in report.paths]
+    batches = [paths[i : i + CLEANUP_BATCH_SIZE] for i in range(0, len(paths), CLEANUP_BATCH_SIZE)]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        list(executor.map(_remove_batch, batches))
+
+    return report
+
+
+def count_files(addon_path: Path) -> int:
+    """Count the files making up an addon.
 
-    file_count = 0
-    for path in addon.rglob("*"):
-        if path.is_dir() and path.name == "__pycache__":
-            shutil.rmtree(path)
-            file_count += 1
-        elif path.suffix in rm_suffixes:
-            path.unlink()
-            file_count += 1
+    Args:
+        addon_path: The addon module or package path.
 
-    return file_count
+    Returns:
+        Number of files.
+    """
+    if addon_path.is_file():
+        return 1
 
+    return sum(1 for entry in addon_path.rglob("*") if entry.is_file())
 
-def get_addon_srcs(addons_src: Path, excluded_addons: Optional[list[str]] = None) -> list[Path]:
+
+def get_addon_srcs(addons_src: Path, excluded_addons: Optional[list[str]] = None, quiet: bool = False) -> list[Path]:
     """Get a list of addon source paths that need to be installed.
 
     Args:
         addons_src: Path of the directory where addon sources are located.
         excluded_addons: List of addon names to be excluded from the process.
+        quiet: Do not print skipped paths or errors.
 
     Returns:
         The paths of the addons to be installed.
@@ -114,7 +208,8 @@ def get_addon_srcs(addons_src: Path, excluded_addons: Optional[list[str]] = None
             if "bl_info" in path.read_text():
                 return True
 
-        print(f"[italic]Skipping <{path.name}>, no [yellow]bl_info[/yellow] found.[/italic]")
+        if not quiet:
+            print(f"[italic]Skipping <{path.name}>, no [yellow]bl_info[/yellow] found.[/italic]")
 
     if excluded_addons:
         addon_srcs = [path for path in addons_src.iterdir() if path.name not in excluded_addons and is_python(path)]
@@ -122,7 +217,8 @@ def get_addon_srcs(addons_src: Path, excluded_addons: Optional[list[str]] = None
         addon_srcs = [path for path in addons_src.iterdir() if is_python(path)]
 
     if not addon_srcs:
-        print(f"[red]There are no addon sources inside the directory [{addons_src}][/red]")
+        if not quiet:
+            print(f"[red]There are no addon sources inside the directory [{addons_src}][/red]")
         raise typer.Abort()
 
     return addon_srcs
@@ -165,6 +261,21 @@ def parse_toml(toml_path: Path, param_key: str) -> Any:
             return None
 
 
+def parse_toml_section(toml_path: Path) -> dict[str, Any]:
+    """Get the whole [tool.bpydevutil] section from a toml file.
+
+    Args:
+        toml_path: Path to the toml file.
+
+    Returns:
+        The section, empty if it does not exist.
+    """
+    with open(toml_path, "rb") as f:
+        toml_dict = tomli.load(f)
+
+    return toml_dict.get("tool", {}).get("bpydevutil", {})
+
+
 def get_toml() -> Union[Path, None]:
     """Search for the project toml file in the working directory.
 
@@ -1,12 +1,39 @@
 """Pack addon into a ZIP file and automatically generate file information in the title."""
 import ast
-from pathlib import Path
-from typing import Any, Union
-from zipfile import ZIP_DEFLATED, ZipFile
+import json
+import os
+import tempfile
+import time
+from pathlib import Path, PurePosixPath
+from typing import Any, Callable, Optional, Union
+from zipfile import ZIP_DEFLATED, ZipFile, ZipInfo
 
 import typer
 from rich import print
 
+CHUNK_SIZE = 1024 * 1024
+DELTA_MANIFEST = "__delta__.json"
+REPRODUCIBLE_COMPRESSLEVEL = 6
+REPRODUCIBLE_FILE_MODE = 0o100644
+REPRODUCIBLE_DIR_MODE = 0o040755
+ZIP_MIN_EPOCH = 315532800  # 1980-01-01 00:00:00 UTC.
+ZIP_MAX_EPOCH = 4354819198  # 2107-12-31 23:59:58 UTC.
+
+
+def set_compress_level(zip_info: ZipInfo, level: Optional[int]) -> None:
+    """Set the compression level of a member, ZipFile.open ignores the archive level otherwise.
+
+    Python 3.13 made the attribute public as compress_level, older versions only have _compresslevel.
+
+    Args:
+        zip_info: The member.
+        level: The compression level, None for the compressor default.
+    """
+    if hasattr(zip_info, "compress_level"):
+        zip_info.compress_level = level
+    else:
+        zip_info._compresslevel = level
+
 
 class PackAddonsFromSource:
     """Pack addons and generate data for release."""
@@ -87,13 +114,110 @@ class PackAddonsFromSource:
 
         return zip_name
 
-    def pack_addon(self, addon_path: Path, name: str, addons_src: Path) -> None:
+    @staticmethod
+    def get_pack_size(addon_path: Path) -> int:
+        """Get the number of source bytes that packing the addon will read.
+
+        Args:
+            addon_path: The path of the addon.
+
+        Returns:
+            Total size of the addon files in bytes.
+        """
+
+        if addon_path.is_file():
+            return addon_path.stat().st_size
+
+        return sum(entry.stat().st_size for entry in addon_path.rglob("*") if entry.is_file())
+
+    @staticmethod
+    def get_source_date() -> tuple[int, int, int, int, int, int]:
+        """Get the timestamp given to every member of a reproducible archive.
+
+        Returns:
+            ZIP date_time from the SOURCE_DATE_EPOCH environment variable, the earliest ZIP date if it is not set.
+            Dates outside the range ZIP can store are clamped to it.
+
+        Raises:
+            ValueError: SOURCE_DATE_EPOCH is not a whole number of seconds.
+        """
+
+        value = os.environ.get("SOURCE_DATE_EPOCH", "0")
+        try:
+            epoch = int(value)
+        except ValueError:
+            raise ValueError(f"SOURCE_DATE_EPOCH <{value}> is not a whole number of seconds.") from None
+
+        epoch = min(max(epoch, ZIP_MIN_EPOCH), ZIP_MAX_EPOCH)
+
+        return time.gmtime(epoch)[:6]
+
+    @staticmethod
+    def write_member(
+        zip_file: ZipFile,
+        path: Path,
+        arcname: Path,
+        on_progress: Optional[Callable[[int], None]] = None,
+        date_time: Optional[tuple[int, int, int, int, int, int]] = None,
+    ) -> None:
+        """Stream a file into the archive in fixed size chunks.
+
+        Args:
+            zip_file: The open archive.
+            path: Path of the file or folder to write.
+            arcname: Name of the member inside the archive.
+            on_progress: Called with the number of bytes read after every chunk.
+            date_time: Normalise the member timestamp to this value and its permissions to fixed modes.
+        """
+
+        zip_info = ZipInfo.from_file(path, arcname, strict_timestamps=date_time is None)
+
+        if date_time:
+            zip_info.date_time = date_time
+            zip_info.create_system = 3
+            if zip_info.is_dir():
+                zip_info.external_attr = (REPRODUCIBLE_DIR_MODE << 16) | 0x10
+            else:
+                zip_info.external_attr = REPRODUCIBLE_FILE_MODE << 16
+
+        if zip_info.is_dir():
+            zip_file.writestr(zip_info, b"")
+            return
+
+        zip_info.compress_type = zip_file.compression
+        set_compress_level(zip_info, zip_file.compresslevel)
+
+        # ZIP64 headers have to be decided before streaming. ZipInfo.from_file records the file size,
+        # which ZipFile.open uses to reserve them, with a margin for members that do not compress.
+        with open(path, "rb") as src, zip_file.open(zip_info, "w") as dst:
+            while True:
+                chunk = src.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                dst.write(chunk)
+                if on_progress:
+                    on_progress(len(chunk))
+
+    def pack_addon(
+        self,
+        addon_path: Path,
+        name: str,
+        addons_src: Path,
+        on_progress: Optional[Callable[[int], None]] = None,
+        reproducible: bool = False,
+        extra_files: Optional[dict[PurePosixPath, Path]] = None,
+    ) -> None:
         """Pack the addon source into a ZIP file ready for distribution.
 
         Args:
             addon_path: The path of the addon to pack_funcs.
             name: The name of the resulting ZIP file.
             addons_src: The path of the root directory where addon sources are located.
+            on_progress: Called with the number of bytes read after every chunk.
+            reproducible: Sort members and normalise timestamps, permissions and compression,
+                so identical sources always produce byte-identical archives.
+            extra_files: Files from outside the sources, such as vendored packages,
+                keyed by their path relative to the addon folder.
         """
 
         if not name.endswith(".zip"):
@@ -101,9 +225,163 @@ class PackAddonsFromSource:
 
         zip_path = self.release_dir / name
 
-        with ZipFile(zip_path, "w", ZIP_DEFLATED) as zip_file:
-            if addon_path.is_dir():
-                for entry in addon_path.rglob("*"):
-                    zip_file.write(Path(entry), entry.relative_to(addons_src))
-            else:
-                zip_file.write(Path(addon_path), addon_path.relative_to(addons_src))
+        paths = list(addon_path.rglob("*")) if addon_path.is_dir() else [addon_path]
+        entries = [(path, path.relative_to(addons_src)) for path in paths]
+        if extra_files:
+            addon_arcname = addon_path.relative_to(addons_src)
+            entries.extend((path, Path(addon_arcname, relative)) for relative, path in extra_files.items())
+
+        date_time = None
+        compresslevel = None
+        if reproducible:
+            entries.sort(key=lambda entry: entry[1].as_posix())
+            date_time = self.get_source_date()
+            compresslevel = REPRODUCIBLE_COMPRESSLEVEL
+
+        with ZipFile(zip_path, "w", ZIP_DEFLATED, allowZip64=True, compresslevel=compresslevel) as zip_file:
+            for path, arcname in entries:
+                self.write_member(zip_file, Path(path), arcname, on_progress, date_time)
+
+    @staticmethod
+    def copy_member(src_zip: ZipFile, zip_info: ZipInfo, dst_zip: ZipFile) -> None:
+        """Stream a member from one archive into another in fixed size chunks, keeping its metadata.
+
+        Args:
+            src_zip: The archive to read from.
+            zip_info: The member to copy.
+            dst_zip: The archive to write to.
+        """
+
+        new_info = ZipInfo(zip_info.filename, zip_info.date_time)
+        new_info.external_attr = zip_info.external_attr
+        new_info.create_system = zip_info.create_system
+        new_info.compress_type = zip_info.compress_type
+
+        if zip_info.is_dir():
+            dst_zip.writestr(new_info, b"")
+            return
+
+        # ZipFile.open decides on ZIP64 headers from the size, which a fresh ZipInfo does not have yet.
+        new_info.file_size = zip_info.file_size
+
+        with src_zip.open(zip_info) as src, dst_zip.open(new_info, "w") as dst:
+            while True:
+                chunk = src.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                dst.write(chunk)
+
+    def pack_delta(self, old_zip: Path, new_zip: Path) -> tuple[Path, dict[str, Any]]:
+        """Pack the members which differ between two releases of an addon into a patch archive.
+
+        Args:
+            old_zip: The previous release.
+            new_zip: The new release.
+
+        Returns:
+            Path of the patch archive.
+            The manifest stored inside it.
+        """
+
+        delta_path = self.release_dir / f"{new_zip.stem}.delta.zip"
+
+        with ZipFile(old_zip) as old_file, ZipFile(new_zip) as new_file:
+            old_members = {info.filename: info for info in old_file.infolist()}
+            new_members = {info.filename: info for info in new_file.infolist()}
+
+            manifest = {
+                "base": old_zip.name,
+                "target": new_zip.name,
+                "added": [],
+                "changed": [],
+                "removed": sorted(name for name in old_members if name not in new_members),
+                # CRC and size of every member taken from the base, checked before a delta is applied.
+                "inherited": {},
+            }
+
+            with ZipFile(delta_path, "w", ZIP_DEFLATED, allowZip64=True) as delta_file:
+                for name, info in new_members.items():
+                    old_info = old_members.get(name)
+                    if old_info is None:
+                        manifest["added"].append(name)
+                    elif old_info.CRC != info.CRC or old_info.file_size != info.file_size:
+                        manifest["changed"].append(name)
+                    else:
+                        manifest["inherited"][name] = [info.CRC, info.file_size]
+                        continue
+
+                    self.copy_member(new_file, info, delta_file)
+
+                # Date the manifest from the release, not the clock, so reproducible releases give reproducible deltas.
+                manifest_date = max((info.date_time for info in new_members.values()), default=(1980, 1, 1, 0, 0, 0))
+                manifest_info = ZipInfo(DELTA_MANIFEST, manifest_date)
+                manifest_info.compress_type = ZIP_DEFLATED
+                delta_file.writestr(manifest_info, json.dumps(manifest, indent=2))
+
+        return delta_path, manifest
+
+    @staticmethod
+    def apply_delta(base_zip: Path, delta_zip: Path, output_zip: Path) -> dict[str, Any]:
+        """Rebuild a release from the previous release and a patch archive.
+
+        Args:
+            base_zip: The previous release the patch was built against.
+            delta_zip: The patch archive.
+            output_zip: Path of the rebuilt release, which may be the base or the patch archive itself.
+
+        Returns:
+            The manifest of the patch archive.
+        """
+
+        # Written next to the output and moved into place once the inputs are closed,
+        # so the output can replace an input and a failed rebuild leaves nothing behind.
+        fd, staging = tempfile.mkstemp(prefix=f".{output_zip.name}.", suffix=".tmp", dir=output_zip.parent)
+        os.close(fd)
+        try:
+            manifest = PackAddonsFromSource._rebuild(base_zip, delta_zip, Path(staging))
+            os.replace(staging, output_zip)
+        finally:
+            Path(staging).unlink(missing_ok=True)
+
+        return manifest
+
+    @staticmethod
+    def _rebuild(base_zip: Path, delta_zip: Path, output_zip: Path) -> dict[str, Any]:
+        """Check the base matches a patch archive and write the rebuilt release, see apply_delta."""
+
+        with ZipFile(base_zip) as base_file, ZipFile(delta_zip) as delta_file:
+            if DELTA_MANIFEST not in delta_file.namelist():
+                print(f"[red]<{delta_zip.name}> is not a delta package, it has no {DELTA_MANIFEST}.[/red]")
+                raise typer.Abort()
+
+            manifest = json.loads(delta_file.read(DELTA_MANIFEST))
+            base_members = {info.filename: info for info in base_file.infolist()}
+            inherited = manifest["inherited"]
+            replaced = set(manifest["changed"]) | set(manifest["removed"])
+
+            missing = [
+                name for name in [*manifest["changed"], *manifest["removed"], *inherited] if name not in base_members
+            ]
+            differing = [
+                name
+                for name, (crc, size) in inherited.items()
+                if name in base_members and (base_members[name].CRC, base_members[name].file_size) != (crc, size)
+            ]
+            unexpected = [name for name in base_members if name not in inherited and name not in replaced]
+
+            if missing or differing or unexpected:
+                print(f"[red]<{base_zip.name}> does not match the delta base <{manifest['base']}>.[/red]")
+                for label, names in (("Missing", missing), ("Differing", differing), ("Unexpected", unexpected)):
+                    if names:
+                        print(f"[red]{label} members: {', '.join(sorted(names))}[/red]")
+                raise typer.Abort()
+
+            with ZipFile(output_zip, "w", ZIP_DEFLATED, allowZip64=True) as output_file:
+                for name in inherited:
+                    PackAddonsFromSource.copy_member(base_file, base_members[name], output_file)
+
+                for info in delta_file.infolist():
+                    if info.filename != DELTA_MANIFEST:
+                        PackAddonsFromSource.copy_member(delta_file, info, output_file)
+
+        return manifest
@@ -0,0 +1,202 @@
+"""Record the timings of each run in a local ledger and flag runs slower than their recent history."""
+import json
+import os
+import statistics
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from importlib import metadata
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+DEFAULT_LEDGER = ".bpydevutil/perf.jsonl"
+MIN_BASELINE_RUNS = 3
+
+
+def get_tool_version() -> str:
+    """Get the installed version of bpy-dev-utils, "unknown" when running from a source checkout."""
+    try:
+        return metadata.version("bpy-dev-utils")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+class PerfRecorder:
+    """Collect phase durations and totals over a single run of a command."""
+
+    def __init__(self, command: str, src_dir: Path) -> None:
+        """
+        Args:
+            command: Name of the command being run.
+            src_dir: Addon sources directory, runs are only compared with runs over the same sources.
+        """
+        self.command = command
+        self.src_dir = Path(src_dir).resolve()
+        self.phases = {}
+        self.addons = 0
+        self.files = 0
+        self.bytes = 0
+        self._time = time.time()
+        self._start = time.perf_counter()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time a phase of the run, repeated phases with the same name are added together.
+
+        Args:
+            name: Name of the phase.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    def to_record(self) -> dict[str, Any]:
+        """Build the ledger record of the run so far."""
+        return {
+            "time": round(self._time, 3),
+            "command": self.command,
+            "src": str(self.src_dir),
+            "version": get_tool_version(),
+            "duration": round(time.perf_counter() - self._start, 6),
+            "phases": {name: round(duration, 6) for name, duration in self.phases.items()},
+            "addons": self.addons,
+            "files": self.files,
+            "bytes": self.bytes,
+        }
+
+
+class PerfLedger:
+    """Append-only history of run records, stored as one JSON object per line."""
+
+    def __init__(self, path: Path) -> None:
+        """
+        Args:
+            path: Path of the ledger file.
+        """
+        self.path = Path(path)
+
+    def append(self, record: dict[str, Any]) -> None:
+        """Add a record to the end of the ledger.
+
+        Args:
+            record: The record, from PerfRecorder.to_record.
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+    def read(self) -> list[dict[str, Any]]:
+        """Read every record in the ledger, oldest first.
+
+        Returns:
+            The records, lines which cannot be parsed are skipped.
+        """
+        if not self.path.is_file():
+            return []
+
+        records = []
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(record, dict) and "command" in record and "duration" in record:
+                    records.append(record)
+
+        return records
+
+
+@dataclass
+class RunReport:
+    """A run compared with the rolling baseline of the runs before it."""
+
+    record: dict[str, Any]
+    baseline: Optional[float] = None  # Median duration of the previous runs, None without enough history.
+    change: Optional[float] = None  # Fraction slower than the baseline, negative when faster.
+    regression: bool = False
+
+
+def analyze(records: list[dict[str, Any]], window: int = 10, threshold: float = 0.25) -> list[RunReport]:
+    """Compare each run with the median of the previous runs of the same command over the same sources.
+
+    Args:
+        records: Ledger records, oldest first.
+        window: Number of previous runs the baseline is taken from.
+        threshold: Fraction slower than the baseline at which a run is flagged, eg 0.25 for 25%.
+
+    Returns:
+        One report per record, in the same order.
+    """
+    history = {}
+    reports = []
+    for record in records:
+        previous = history.setdefault((record["command"], record.get("src")), [])
+        report = RunReport(record)
+
+        if len(previous) >= MIN_BASELINE_RUNS:
+            report.baseline = statistics.median(previous[-window:])
+            if report.baseline > 0:
+                report.change = record["duration"] / report.baseline - 1
+                report.regression = report.change > threshold
+
+        previous.append(record["duration"])
+        reports.append(report)
+
+    return reports
+
+
+def _escape_label(value: Any) -> str:
+    """Escape a label value for the OpenMetrics text format."""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def write_openmetrics(reports: list[RunReport], path: Path) -> None:
+    """Export the latest run of each command and sources directory as an OpenMetrics textfile.
+
+    The file is replaced atomically so a node exporter textfile collector never reads a partial file.
+
+    Args:
+        reports: Reports from analyze, oldest first.
+        path: Path of the textfile, usually ending in ".prom".
+    """
+    latest = {}
+    for report in reports:
+        latest[(report.record["command"], report.record.get("src"))] = report
+
+    metrics = {
+        "run_timestamp_seconds": ("Time the run started.", lambda r: r.record.get("time")),
+        "run_duration_seconds": ("Duration of the run.", lambda r: r.record["duration"]),
+        "run_baseline_seconds": ("Median duration of the previous runs.", lambda r: r.baseline),
+        "run_regression": ("1 if the run was flagged as slower than its baseline.", lambda r: int(r.regression)),
+        "run_addons": ("Number of addons processed.", lambda r: r.record.get("addons")),
+        "run_files": ("Number of files processed.", lambda r: r.record.get("files")),
+        "run_bytes": ("Number of bytes processed.", lambda r: r.record.get("bytes")),
+    }
+
+    lines = []
+    for name, (help_text, get_value) in metrics.items():
+        lines += [f"# TYPE bpydevutil_{name} gauge", f"# HELP bpydevutil_{name} {help_text}"]
+        for (command, src), report in latest.items():
+            value = get_value(report)
+            if value is not None:
+                labels = f'command="{_escape_label(command)}",src="{_escape_label(src)}"'
+                lines.append(f"bpydevutil_{name}{{{labels}}} {value}")
+
+    lines += [
+        "# TYPE bpydevutil_phase_duration_seconds gauge",
+        "# HELP bpydevutil_phase_duration_seconds Duration of a phase of the run.",
+    ]
+    for (command, src), report in latest.items():
+        for phase, duration in report.record.get("phases", {}).items():
+            labels = f'command="{_escape_label(command)}",src="{_escape_label(src)}",phase="{_escape_label(phase)}"'
+            lines.append(f"bpydevutil_phase_duration_seconds{{{labels}}} {duration}")
+    lines.append("# EOF")
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    staging = path.with_name(f".{path.name}.tmp")
+    staging.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    os.replace(staging, path)
@@ -0,0 +1,226 @@
+"""Work out which addon submodules need reloading after a change, in an order that is safe to reload them in."""
+import ast
+from pathlib import Path
+from typing import Optional
+
+
+def get_module_name(addon_path: Path, file: Path) -> str:
+    """Get the dotted module name of a source file as Blender imports it.
+
+    Args:
+        addon_path: The addon source path.
+        file: Path of a python file inside the addon.
+
+    Returns:
+        The module name, eg "my_addon.operators.export".
+    """
+
+    if addon_path.is_file():
+        return addon_path.stem
+
+    parts = list(file.relative_to(addon_path).with_suffix("").parts)
+    if parts[-1] == "__init__":
+        parts.pop()
+
+    return ".".join([addon_path.name, *parts])
+
+
+def get_addon_modules(addon_path: Path) -> dict[str, Path]:
+    """Map every module of an addon to its source file.
+
+    Args:
+        addon_path: The addon source path.
+
+    Returns:
+        Dictionary of module names and source file paths.
+    """
+
+    if addon_path.is_file():
+        return {addon_path.stem: addon_path}
+
+    return {
+        get_module_name(addon_path, file): file
+        for file in addon_path.rglob("*.py")
+        if "__pycache__" not in file.relative_to(addon_path).parts
+    }
+
+
+def _resolve_import(node: ast.AST, module: str, is_package: bool, modules: dict[str, Path]) -> set[str]:
+    """Resolve an import statement to the addon modules it loads.
+
+    Args:
+        node: The Import or ImportFrom node.
+        module: Name of the module containing the statement.
+        is_package: The module is a package __init__ file.
+        modules: Every module of the addon.
+
+    Returns:
+        Names of the addon modules that the statement imports.
+    """
+
+    def closest_module(name: str) -> Optional[str]:
+        """Strip attributes from a dotted name until it matches an addon module."""
+        while name:
+            if name in modules:
+                return name
+            name = name.rpartition(".")[0]
+        return None
+
+    candidates = []
+    if isinstance(node, ast.Import):
+        candidates = [alias.name for alias in node.names]
+    elif isinstance(node, ast.ImportFrom):
+        if node.level:
+            package_parts = module.split(".") if is_package else module.split(".")[:-1]
+            base_parts = package_parts[: len(package_parts) - (node.level - 1)]
+            base = ".".join(base_parts + ([node.module] if node.module else []))
+        else:
+            base = node.module or ""
+        # "from package import name" loads a submodule when one exists, otherwise just the package.
+        candidates = [f"{base}.{alias.name}" for alias in node.names if alias.name != "*"] or [base]
+
+    resolved = {closest_module(name) for name in candidates}
+    resolved.discard(None)
+    resolved.discard(module)
+
+    return resolved
+
+
+def build_import_graph(addon_path: Path) -> dict[str, set[str]]:
+    """Build the graph of imports between the modules of an addon.
+
+    Args:
+        addon_path: The addon source path.
+
+    Returns:
+        Dictionary of module names and the addon modules each one imports.
+    """
+
+    modules = get_addon_modules(addon_path)
+    graph = {}
+
+    for module, file in modules.items():
+        try:
+            tree = ast.parse(file.read_text(), str(file))
+        except SyntaxError:
+            graph[module] = set()
+            continue
+
+        is_package = file.name == "__init__.py"
+        graph[module] = set()
+        for node in ast.walk(tree):
+            if isinstance(node, (ast.Import, ast.ImportFrom)):
+                graph[module] |= _resolve_import(node, module, is_package, modules)
+
+    return graph
+
+
+def get_modules_to_reload(graph: dict[str, set[str]], changed_modules: set[str]) -> list[str]:
+    """Find the minimal set of modules to reload and sort them so dependencies are reloaded first.
+
+    Args:
+        graph: Import graph built by build_import_graph.
+        changed_modules: Names of the modules whose sources changed.
+
+    Returns:
+        Module names in reload order.
+    """
+
+    dependents = {module: set() for module in graph}
+    for module, imports in graph.items():
+        for imported in imports:
+            dependents[imported].add(module)
+
+    # Anything importing a changed module holds references to stale objects, so it has to be reloaded as well.
+    affected = set()
+    pending = [module for module in changed_modules if module in graph]
+    while pending:
+        module = pending.pop()
+        if module not in affected:
+            affected.add(module)
+            pending.extend(dependents[module])
+
+    remaining = {module: graph[module] & affected for module in affected}
+    order = []
+    while remaining:
+        ready = sorted(module for module, imports in remaining.items() if not imports)
+        if not ready:
+            # Import cycle, break it deterministically.
+            ready = [min(remaining)]
+
+        for module in ready:
+            order.append(module)
+            del remaining[module]
+        for imports in remaining.values():
+            imports.difference_update(ready)
+
+    return order
+
+
+def plan_reload(addon_srcs: list[Path], changed_files: list[Path]) -> tuple[list[str], list[str], list[Path]]:
+    """Work out what to reload for a set of changed files spread across any number of addons.
+
+    Args:
+        addon_srcs: The addon source paths.
+        changed_files: Paths of the source files that changed.
+
+    Returns:
+        Module names in reload order.
+        Root module names of the affected addons.
+        Changed files which do not belong to any addon module.
+    """
+
+    changed_files = [file.resolve() for file in changed_files]
+    modules, addons = [], []
+    unmatched = set(changed_files)
+
+    for addon_path in addon_srcs:
+        addon_modules = get_addon_modules(addon_path)
+        files = {file.resolve(): module for module, file in addon_modules.items()}
+        changed_modules = {files[file] for file in changed_files if file in files}
+        if not changed_modules:
+            continue
+
+        unmatched -= {file for file in changed_files if file in files}
+        modules.extend(get_modules_to_reload(build_import_graph(addon_path), changed_modules))
+        addons.append(get_module_name(addon_path, addon_path / "__init__.py"))
+
+    return modules, addons, sorted(unmatched)
+
+
+def build_reload_script(modules: list[str], addons: list[str]) -> str:
+    """Build a python script which reloads modules inside a running Blender session.
+
+    Args:
+        modules: Module names in reload order.
+        addons: Root module names of the addons being reloaded, these are unregistered first and registered last.
+
+    Returns:
+        The script source.
+    """
+
+    return "\n".join(
+        [
+            "import importlib",
+            "import sys",
+            "",
+            f"addons = {addons!r}",
+            f"modules = {modules!r}",
+            "",
+            "for name in addons:",
+            "    addon = sys.modules.get(name)",
+            "    if addon is not None and hasattr(addon, 'unregister'):",
+            "        addon.unregister()",
+            "",
+            "for name in modules:",
+            "    module = sys.modules.get(name)",
+            "    if module is not None:",
+            "        importlib.reload(module)",
+            "",
+            "for name in addons:",
+            "    addon = sys.modules.get(name)",
+            "    if addon is not None and hasattr(addon, 'register'):",
+            "        addon.register()",
+            "",
+        ]
+    )
@@ -0,0 +1,342 @@
+"""Run addon unit tests across a pool of warm interpreter workers and report the results as JUnit XML."""
+import json
+import queue
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+from xml.etree import ElementTree
+
+from bpydevutil.functions.runner_worker import MARKER
+
+WORKER_SCRIPT = Path(__file__).parent / "runner_worker.py"
+STDERR_TAIL_LINES = 20
+
+
+@dataclass
+class TestCaseResult:
+    """Outcome of a single test case."""
+
+    classname: str
+    name: str
+    time: float
+    status: str
+    message: str = ""
+    details: str = ""
+
+
+@dataclass
+class ModuleResult:
+    """Outcome of every test case in a test module."""
+
+    module: Path
+    duration: float
+    worker: int
+    cases: list[TestCaseResult] = field(default_factory=list)
+    output: str = ""
+
+    def count(self, status: str) -> int:
+        """Count the test cases with a status."""
+        return sum(1 for case in self.cases if case.status == status)
+
+
+def build_worker_command(blender_exe: Optional[str] = None, python_exe: Optional[str] = None) -> list[str]:
+    """Build the command which starts a worker.
+
+    Args:
+        blender_exe: Path to blender.exe, tests then run inside a background Blender.
+        python_exe: Python interpreter used when no Blender is given, defaults to the current one.
+
+    Returns:
+        The command, arguments for the worker follow it.
+    """
+    if blender_exe:
+        return [blender_exe, "--background", "--factory-startup", "--python", str(WORKER_SCRIPT), "--"]
+
+    return [python_exe or sys.executable, str(WORKER_SCRIPT)]
+
+
+def discover_test_modules(tests_dir: Path, pattern: str = "test_*.py") -> list[Path]:
+    """Find the test modules inside a directory.
+
+    Args:
+        tests_dir: Directory to search.
+        pattern: Glob pattern matching test module file names.
+
+    Returns:
+        The test module paths, sorted.
+    """
+    return sorted(path for path in tests_dir.rglob(pattern) if "__pycache__" not in path.parts)
+
+
+def load_durations(path: Path) -> dict[str, float]:
+    """Load historical module durations.
+
+    Args:
+        path: Path of the durations file.
+
+    Returns:
+        Test module paths and their last recorded duration, empty if there is no usable history.
+    """
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def save_durations(path: Path, results: list[ModuleResult], durations: dict[str, float]) -> None:
+    """Record the module durations of a run for the next one to balance with.
+
+    Args:
+        path: Path of the durations file.
+        results: Results of the run.
+        durations: The previous durations, kept for modules that did not run.
+    """
+    durations = {**durations, **{str(result.module): result.duration for result in results}}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(durations, indent=2, sort_keys=True))
+
+
+def schedule(modules: list[Path], durations: dict[str, float]) -> list[Path]:
+    """Order modules longest first so the pool finishes as evenly as possible.
+
+    Args:
+        modules: Test module paths.
+        durations: Historical module durations.
+
+    Returns:
+        The modules in dispatch order. Modules without history are assumed to be the slowest.
+    """
+    return sorted(modules, key=lambda module: -durations.get(str(module), float("inf")))
+
+
+class _WorkerProcess:
+    """A running worker, read from a background thread so responses can be waited for with a timeout."""
+
+    def __init__(self, command: list[str]) -> None:
+        """
+        Args:
+            command: Full command starting the worker.
+        """
+        # Kept in a file rather than a pipe so a chatty interpreter never blocks on a full buffer.
+        self.stderr = tempfile.TemporaryFile("w+", errors="replace")
+        self.process = subprocess.Popen(
+            command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=self.stderr, text=True, bufsize=1
+        )
+        self.lines = queue.Queue()
+        threading.Thread(target=self._pump, daemon=True).start()
+
+    def _pump(self) -> None:
+        """Move stdout lines onto the queue, ending with None once the worker exits."""
+        for line in self.process.stdout:
+            self.lines.put(line)
+        self.lines.put(None)
+
+    def send(self, module: Path) -> None:
+        """Ask the worker to run a test module."""
+        self.process.stdin.write(json.dumps({"module": str(module)}) + "\n")
+        self.process.stdin.flush()
+
+    def read_response(self, timeout: Optional[float] = None) -> Optional[dict]:
+        """Wait for the next protocol line, skipping anything else the worker prints.
+
+        Args:
+            timeout: Seconds to wait, None to wait forever.
+
+        Returns:
+            The response, None if the worker exited.
+
+        Raises:
+            TimeoutError: No response arrived in time.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                line = self.lines.get(timeout=remaining)
+            except queue.Empty:
+                raise TimeoutError from None
+
+            if line is None:
+                return None
+            if line.startswith(MARKER):
+                return json.loads(line[len(MARKER) :])
+
+    def stderr_tail(self, lines: int = STDERR_TAIL_LINES) -> str:
+        """Get the last lines the worker wrote to stderr."""
+        self.stderr.flush()
+        self.stderr.seek(0)
+        return "".join(self.stderr.readlines()[-lines:])
+
+    def kill(self) -> None:
+        """Stop the worker immediately."""
+        self.process.kill()
+        self.process.wait()
+        self.stderr.close()
+
+    def close(self) -> None:
+        """Let the worker finish and exit."""
+        if self.process.poll() is None:
+            self.process.stdin.close()
+            self.process.wait()
+        self.stderr.close()
+
+
+class TestWorkerPool:
+    """Pool of warm interpreter processes which each run one test module at a time."""
+
+    def __init__(
+        self,
+        command: list[str],
+        workers: int,
+        src_dirs: list[Path],
+        addons: list[str] = None,
+        timeout: Optional[float] = None,
+    ) -> None:
+        """
+        Args:
+            command: Command starting a worker, from build_worker_command.
+            workers: Number of worker processes.
+            src_dirs: Directories added to the worker import path.
+            addons: Addon module names enabled in each worker when running inside Blender.
+            timeout: Seconds a worker may take to start or to run one test module, None for no limit.
+        """
+        self.command = command
+        self.workers = max(1, workers)
+        self.worker_args = [arg for src_dir in src_dirs for arg in ("--src-dir", str(src_dir))]
+        self.worker_args += [arg for addon in addons or [] for arg in ("--addon", addon)]
+        self.timeout = timeout
+
+    def _start_worker(self) -> _WorkerProcess:
+        """Start a worker and wait until it is ready."""
+        worker = _WorkerProcess(self.command + self.worker_args)
+        try:
+            ready = worker.read_response(self.timeout)
+        except TimeoutError:
+            ready = None
+
+        if ready is None:
+            worker.process.kill()
+            worker.process.wait()
+            details = worker.stderr_tail()
+            worker.stderr.close()
+            raise RuntimeError(f"Test worker failed to start: {' '.join(self.command)}\n{details}".rstrip())
+
+        return worker
+
+    def _work(self, worker_id: int, jobs: queue.Queue, results: list[ModuleResult]) -> None:
+        """Take modules from the queue until it is empty, restarting the worker process if it dies or hangs."""
+        worker = None
+        try:
+            while True:
+                try:
+                    module = jobs.get_nowait()
+                except queue.Empty:
+                    return
+
+                if worker is None or worker.process.poll() is not None:
+                    worker = self._start_worker()
+
+                start = time.perf_counter()
+                message = "The test worker exited."
+                try:
+                    worker.send(module)
+                    response = worker.read_response(self.timeout)
+                except TimeoutError:
+                    response = None
+                    message = f"The test module did not finish within {self.timeout:g} seconds."
+                except OSError:
+                    response = None
+
+                if response is None:
+                    details = worker.stderr_tail()
+                    worker.kill()
+                    worker = None
+                    duration = time.perf_counter() - start
+                    case = TestCaseResult(str(module), "<worker>", duration, "error", message, details)
+                    results.append(ModuleResult(module, case.time, worker_id, [case]))
+                    continue
+
+                cases = [TestCaseResult(**case) for case in response["cases"]]
+                results.append(ModuleResult(module, response["duration"], worker_id, cases, response["output"]))
+        finally:
+            if worker:
+                worker.close()
+
+    def run(self, modules: list[Path], durations: Optional[dict[str, float]] = None) -> list[ModuleResult]:
+        """Run test modules across the pool.
+
+        Args:
+            modules: Test module paths.
+            durations: Historical module durations used to balance the load.
+
+        Returns:
+            One result per module, in the order the modules were given.
+        """
+        jobs = queue.Queue()
+        for module in schedule(modules, durations or {}):
+            jobs.put(module)
+
+        results = []
+        errors = []
+
+        def work(worker: int) -> None:
+            try:
+                self._work(worker, jobs, results)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=work, args=(i,)) for i in range(min(self.workers, len(modules)))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        if errors and len(results) < len(modules):
+            raise errors[0]
+
+        order = {module: i for i, module in enumerate(modules)}
+        return sorted(results, key=lambda result: order[result.module])
+
+
+def write_junit_xml(results: list[ModuleResult], path: Path) -> None:
+    """Write results as a JUnit XML report, one test suite per module.
+
+    Args:
+        results: The module results.
+        path: Path of the report.
+    """
+    totals = {"tests": 0, "failures": 0, "errors": 0, "skipped": 0, "time": 0.0}
+    root = ElementTree.Element("testsuites")
+
+    for result in results:
+        counts = {
+            "tests": len(result.cases),
+            "failures": result.count("failed"),
+            "errors": result.count("error"),
+            "skipped": result.count("skipped"),
+            "time": result.duration,
+        }
+        for key, value in counts.items():
+            totals[key] += value
+
+        suite = ElementTree.SubElement(
+            root, "testsuite", {"name": str(result.module), **{k: str(v) for k, v in counts.items()}}
+        )
+        for case in result.cases:
+            element = ElementTree.SubElement(
+                suite, "testcase", {"classname": case.classname, "name": case.name, "time": f"{case.time:.6f}"}
+            )
+            tag = {"failed": "failure", "error": "error", "skipped": "skipped"}.get(case.status)
+            if tag:
+                ElementTree.SubElement(element, tag, {"message": case.message}).text = case.details or None
+
+        if result.output:
+            ElementTree.SubElement(suite, "system-out").text = result.output
+
+    root.attrib.update({k: str(v) for k, v in totals.items()})
+    ElementTree.ElementTree(root).write(path, encoding="utf-8", xml_declaration=True)
@@ -0,0 +1,160 @@
+"""Warm test worker, run inside Blender or any Python interpreter by the test runner pool.
+
+Only the standard library is used, Blender's bundled Python does not have bpydevutil installed.
+Requests are read from stdin and responses written to stdout as JSON lines prefixed with MARKER,
+so anything else the interpreter prints is ignored by the pool. Both are moved to duplicated file
+descriptors before any test code runs, tests see an empty stdin and a stdout leading to stderr.
+"""
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import sys
+import time
+import traceback
+import unittest
+
+MARKER = "@@bpydevutil@@ "
+
+
+class _RecordingResult(unittest.TestResult):
+    """Record the status, duration and output of every test case."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.cases = []
+        self._start = 0.0
+
+    def _record(self, test, status, err=None, message=""):
+        details = self._exc_info_to_string(err, test) if err else ""
+        if err:
+            message = f"{err[0].__name__}: {err[1]}"
+
+        self.cases.append(
+            {
+                "classname": f"{type(test).__module__}.{type(test).__qualname__}",
+                "name": getattr(test, "_testMethodName", str(test)),
+                "time": time.perf_counter() - self._start,
+                "status": status,
+                "message": message,
+                "details": details,
+            }
+        )
+
+    def startTest(self, test):
+        super().startTest(test)
+        self._start = time.perf_counter()
+
+    def addSuccess(self, test):
+        self._record(test, "passed")
+
+    def addFailure(self, test, err):
+        self._record(test, "failed", err)
+
+    def addError(self, test, err):
+        self._record(test, "error", err)
+
+    def addSkip(self, test, reason):
+        self._record(test, "skipped", message=reason)
+
+    def addExpectedFailure(self, test, err):
+        self._record(test, "passed", message="Expected failure.")
+
+    def addUnexpectedSuccess(self, test):
+        self._record(test, "failed", message="Unexpected success.")
+
+
+def run_module(path: str) -> dict:
+    """Import a test module from its path and run every test case in it.
+
+    Args:
+        path: Path of the test module.
+
+    Returns:
+        The response sent back to the pool.
+    """
+    start = time.perf_counter()
+    result = _RecordingResult()
+    output = io.StringIO()
+    stdin = sys.stdin
+
+    with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+        # Tests reading input get an immediate EOFError instead of waiting forever.
+        sys.stdin = io.StringIO()
+        try:
+            spec = importlib.util.spec_from_file_location(os.path.splitext(os.path.basename(path))[0], path)
+            module = importlib.util.module_from_spec(spec)
+            sys.modules[spec.name] = module
+            spec.loader.exec_module(module)
+            unittest.defaultTestLoader.loadTestsFromModule(module).run(result)
+        except Exception:
+            result.cases.append(
+                {
+                    "classname": path,
+                    "name": "<module>",
+                    "time": time.perf_counter() - start,
+                    "status": "error",
+                    "message": "The test module could not be loaded.",
+                    "details": traceback.format_exc(),
+                }
+            )
+        finally:
+            sys.stdin = stdin
+
+    return {"module": path, "duration": time.perf_counter() - start, "cases": result.cases, "output": output.getvalue()}
+
+
+def enable_addons(addons: list) -> None:
+    """Enable addons when running inside Blender."""
+    try:
+        import addon_utils
+    except ImportError:
+        return
+
+    for addon in addons:
+        addon_utils.enable(addon, default_set=True)
+
+
+def open_protocol() -> tuple:
+    """Move the protocol streams out of reach of test code.
+
+    Returns:
+        The request and response streams, on duplicates of the original stdin and stdout.
+    """
+    requests = os.fdopen(os.dup(0), "r")
+    responses = os.fdopen(os.dup(1), "w")
+
+    sys.stdout.flush()
+    devnull = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(devnull, 0)
+    os.close(devnull)
+    os.dup2(2, 1)
+
+    return requests, responses
+
+
+def main() -> None:
+    """Serve requests until stdin closes."""
+    argv = sys.argv[sys.argv.index("--") + 1 :] if "--" in sys.argv else sys.argv[1:]
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--src-dir", action="append", default=[])
+    parser.add_argument("--addon", action="append", default=[])
+    args = parser.parse_args(argv)
+
+    requests, responses = open_protocol()
+    sys.path[:0] = args.src_dir
+    enable_addons(args.addon)
+
+    responses.write(MARKER + json.dumps({"ready": True}) + "\n")
+    responses.flush()
+
+    for line in requests:
+        request = json.loads(line)
+        responses.write(MARKER + json.dumps(run_module(request["module"])) + "\n")
+        responses.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,380 @@
+"""Resident daemon which keeps addon source indexes warm between CLI calls."""
+import json
+import os
+import socket
+import socketserver
+import threading
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from bpydevutil.functions import common_funcs
+from bpydevutil.functions.pack_funcs import PackAddonsFromSource
+
+
+def default_socket_path() -> Path:
+    """Get the default location of the daemon socket.
+
+    Returns:
+        Path to a socket inside a directory private to the user, the runtime directory if there is one.
+    """
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir and Path(runtime_dir).is_dir():
+        return Path(runtime_dir) / "bpydevutil" / "daemon.sock"
+
+    return Path.home() / ".cache" / "bpydevutil" / "daemon.sock"
+
+
+def daemon_supported() -> bool:
+    """Check that the platform supports unix domain sockets."""
+    return hasattr(socket, "AF_UNIX")
+
+
+class AddonIndex:
+    """In-memory index of addon sources and their bl_info."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._indexes: dict[Path, dict[str, Any]] = {}
+
+    @staticmethod
+    def _entry_file(path: Path) -> Optional[Path]:
+        """Get the file which should contain the bl_info of an addon candidate.
+
+        Args:
+            path: Path of a file or folder inside the sources directory.
+
+        Returns:
+            The module or package __init__ file, None if the path cannot be an addon.
+        """
+        if path.is_dir():
+            init = path / "__init__.py"
+            return init if init.is_file() else None
+
+        if path.suffix == ".py":
+            return path
+
+        return None
+
+    def _signature(self, src_dir: Path) -> tuple:
+        """Build a cheap signature of the sources directory from file modification times.
+
+        Args:
+            src_dir: Directory where addon sources are located.
+
+        Returns:
+            Tuple which changes whenever an addon is added, removed or has its bl_info file modified.
+        """
+        signature = []
+        for path in sorted(src_dir.iterdir()):
+            entry_file = self._entry_file(path)
+            if entry_file:
+                signature.append((path.name, entry_file.stat().st_mtime_ns))
+
+        return tuple(signature)
+
+    def _build(self, src_dir: Path) -> dict[str, Any]:
+        """Scan the sources directory and parse the bl_info of every addon.
+
+        Args:
+            src_dir: Directory where addon sources are located.
+
+        Returns:
+            The index of the sources directory.
+        """
+        signature = self._signature(src_dir)
+        addons = {}
+        for path in src_dir.iterdir():
+            entry_file = self._entry_file(path)
+            if not entry_file:
+                continue
+
+            text = entry_file.read_text()
+            if "bl_info" not in text:
+                continue
+
+            try:
+                bl_info = PackAddonsFromSource.get_addon_data(path)
+            except Exception:
+                # The addon is still indexed, callers fall back to a direct parse to surface the error.
+                bl_info = None
+
+            addons[str(path)] = {"name": path.name, "bl_info": bl_info}
+
+        return {"signature": signature, "addons": addons}
+
+    def get_index(self, src_dir: Path) -> dict[str, Any]:
+        """Get the index of a sources directory, rebuilding it if it is out of date.
+
+        Args:
+            src_dir: Directory where addon sources are located.
+
+        Returns:
+            The index of the sources directory.
+        """
+        src_dir = src_dir.resolve()
+        with self._lock:
+            index = self._indexes.get(src_dir)
+            if index is None or index["signature"] != self._signature(src_dir):
+                index = self._build(src_dir)
+                self._indexes[src_dir] = index
+
+            return index
+
+    def refresh(self) -> None:
+        """Rebuild every known index that has changed on disk, forget directories that no longer exist."""
+        with self._lock:
+            src_dirs = list(self._indexes.keys())
+
+        for src_dir in src_dirs:
+            if not src_dir.is_dir():
+                with self._lock:
+                    self._indexes.pop(src_dir, None)
+                continue
+
+            self.get_index(src_dir)
+
+    def get_addon_srcs(self, src_dir: Path, excluded_addons: Optional[list[str]] = None) -> list[str]:
+        """Get the names of the addon sources inside a sources directory.
+
+        Args:
+            src_dir: Directory where addon sources are located.
+            excluded_addons: List of addon names to be excluded.
+
+        Returns:
+            The file or folder names of the addons.
+        """
+        excluded_addons = excluded_addons or []
+        addons = self.get_index(Path(src_dir))["addons"]
+
+        return [data["name"] for data in addons.values() if data["name"] not in excluded_addons]
+
+    def get_addon_data(self, addon_path: Path) -> Optional[dict[str, Any]]:
+        """Get the bl_info of an addon.
+
+        Args:
+            addon_path: Path of the addon.
+
+        Returns:
+            The bl_info dictionary, None if it could not be extracted.
+        """
+        addon_path = Path(addon_path).resolve()
+        addon = self.get_index(addon_path.parent)["addons"].get(str(addon_path))
+
+        return addon["bl_info"] if addon else None
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Answer a single JSON line request with a single JSON line response."""
+
+    def handle(self) -> None:
+        index: AddonIndex = self.server.index
+
+        try:
+            request = json.loads(self.rfile.readline())
+            command = request["command"]
+
+            if command == "ping":
+                response = {"ok": True}
+            elif command == "addon-srcs":
+                names = index.get_addon_srcs(Path(request["src-dir"]), request.get("excluded-addons"))
+                response = {"ok": True, "addons": names}
+            elif command == "bl-info":
+                response = {"ok": True, "bl_info": index.get_addon_data(Path(request["addon"]))}
+            elif command == "shutdown":
+                response = {"ok": True}
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+            else:
+                response = {"ok": False, "error": f"Unknown command <{command}>."}
+        except Exception as e:
+            response = {"ok": False, "error": str(e)}
+
+        self.wfile.write(json.dumps(response, default=str).encode() + b"\n")
+
+
+class AddonIndexServer:
+    """Unix socket daemon serving an addon index kept current by file watching."""
+
+    def __init__(self, socket_path: Path = None, poll_interval: float = 0.5) -> None:
+        """
+        Args:
+            socket_path: Path of the unix socket to listen on.
+            poll_interval: Seconds between file watcher checks.
+        """
+        self.socket_path = Path(socket_path or default_socket_path())
+        self.poll_interval = poll_interval
+        self.index = AddonIndex()
+        self._stop_watching = threading.Event()
+        self._server = None
+
+    def _watch(self) -> None:
+        """Keep the indexes current until the server is stopped."""
+        while not self._stop_watching.wait(self.poll_interval):
+            try:
+                self.index.refresh()
+            except OSError:
+                continue
+
+    def serve_forever(self) -> None:
+        """Listen for requests until a shutdown request is received."""
+        if DaemonClient(self.socket_path).ping():
+            raise RuntimeError(f"A daemon is already listening on <{self.socket_path}>.")
+
+        # The socket answers with paths which are later deleted and replaced, other users must not reach it.
+        if not self.socket_path.parent.exists():
+            self.socket_path.parent.mkdir(mode=0o700, parents=True)
+        self.socket_path.unlink(missing_ok=True)
+
+        self._server = socketserver.ThreadingUnixStreamServer(str(self.socket_path), _RequestHandler)
+        os.chmod(self.socket_path, 0o600)
+        self._server.daemon_threads = True
+        self._server.index = self.index
+
+        watcher = threading.Thread(target=self._watch, daemon=True)
+        watcher.start()
+
+        try:
+            self._server.serve_forever()
+        finally:
+            self._stop_watching.set()
+            self._server.server_close()
+            self.socket_path.unlink(missing_ok=True)
+
+    def shutdown(self) -> None:
+        """Stop a server running in another thread."""
+        if self._server:
+            self._server.shutdown()
+
+
+class DaemonClient:
+    """Client for the addon index daemon."""
+
+    def __init__(self, socket_path: Path = None, timeout: float = 2.0) -> None:
+        """
+        Args:
+            socket_path: Path of the unix socket the daemon listens on.
+            timeout: Seconds to wait for a response.
+        """
+        self.socket_path = Path(socket_path or default_socket_path())
+        self.timeout = timeout
+
+    def request(self, payload: dict[str, Any]) -> Optional[dict[str, Any]]:
+        """Send a request to the daemon.
+
+        Args:
+            payload: Request dictionary.
+
+        Returns:
+            The response dictionary, None if the daemon is not running or the request failed.
+        """
+        if not daemon_supported() or not self.socket_path.exists():
+            return None
+
+        # Never trust a socket created by another user.
+        if hasattr(os, "getuid") and self.socket_path.stat().st_uid != os.getuid():
+            return None
+
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+                client.settimeout(self.timeout)
+                client.connect(str(self.socket_path))
+                client.sendall(json.dumps(payload).encode() + b"\n")
+                with client.makefile("rb") as f:
+                    response = json.loads(f.readline())
+        except (OSError, ValueError):
+            return None
+
+        return response if response.get("ok") else None
+
+    def ping(self) -> bool:
+        """Check that the daemon is running."""
+        return self.request({"command": "ping"}) is not None
+
+    def stop(self) -> bool:
+        """Ask the daemon to shut down.
+
+        Returns:
+            True if the daemon received the request.
+        """
+        return self.request({"command": "shutdown"}) is not None
+
+    def get_addon_srcs(self, addons_src: Path, excluded_addons: Optional[list[str]] = None) -> Optional[list[Path]]:
+        """Get addon source paths from the daemon.
+
+        Args:
+            addons_src: Path of the directory where addon sources are located.
+            excluded_addons: List of addon names to be excluded from the process.
+
+        Returns:
+            The paths of the addons, None if the daemon could not answer or answered with invalid names.
+        """
+        response = self.request(
+            {"command": "addon-srcs", "src-dir": str(addons_src.resolve()), "excluded-addons": excluded_addons or []}
+        )
+        if not response:
+            return None
+
+        # Names end up in paths which are deleted, only accept existing entries directly inside the sources.
+        names = response.get("addons")
+        if not isinstance(names, list):
+            return None
+        for name in names:
+            if not isinstance(name, str) or name in ("", ".", "..") or Path(name).name != name or "\\" in name:
+                return None
+            if not (addons_src / name).exists():
+                return None
+
+        # Rebuild paths from names so they stay relative to the sources directory the caller supplied.
+        return [addons_src / name for name in names]
+
+    def get_addon_data(self, addon_path: Path) -> Union[dict[str, Any], None]:
+        """Get the bl_info of an addon from the daemon.
+
+        Args:
+            addon_path: Path of the addon.
+
+        Returns:
+            bl_info dictionary, None if the daemon could not answer.
+        """
+        response = self.request({"command": "bl-info", "addon": str(Path(addon_path).resolve())})
+        if not response or not isinstance(response.get("bl_info"), dict):
+            return None
+
+        # JSON has no tuples, restore them so version formatting matches a direct parse.
+        return {k: tuple(v) if isinstance(v, list) else v for k, v in response["bl_info"].items()}
+
+
+def get_addon_srcs(
+    addons_src: Path, excluded_addons: Optional[list[str]] = None, socket_path: Optional[Path] = None
+) -> list[Path]:
+    """Get addon source paths from the daemon when it is running, otherwise scan the directory directly.
+
+    Args:
+        addons_src: Path of the directory where addon sources are located.
+        excluded_addons: List of addon names to be excluded from the process.
+        socket_path: Unix socket the daemon listens on.
+
+    Returns:
+        The paths of the addons to be processed.
+    """
+    addon_srcs = DaemonClient(socket_path).get_addon_srcs(addons_src, excluded_addons)
+    if addon_srcs:
+        return addon_srcs
+
+    return common_funcs.get_addon_srcs(addons_src, excluded_addons)
+
+
+def get_addon_data(addon_path: Path, socket_path: Optional[Path] = None) -> Union[dict[str, Any], None]:
+    """Get the bl_info of an addon from the daemon when it is running, otherwise parse it directly.
+
+    Args:
+        addon_path: Path of the addon.
+        socket_path: Unix socket the daemon listens on.
+
+    Returns:
+        bl_info dictionary.
+    """
+    bl_info = DaemonClient(socket_path).get_addon_data(addon_path)
+    if bl_info is not None:
+        return bl_info
+
+    return PackAddonsFromSource.get_addon_data(addon_path)
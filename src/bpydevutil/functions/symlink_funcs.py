@@ -1,8 +1,23 @@
 """Create a symlink in the Blender addons directory rather than directly installing the addon source."""
 
+import os
+import shutil
+from dataclasses import dataclass, field
 from pathlib import Path
 
 
+@dataclass
+class ReconcileResult:
+    """Names of the addon directory entries touched by a reconcile."""
+
+    created: list[str] = field(default_factory=list)
+    replaced: list[str] = field(default_factory=list)
+    unchanged: list[str] = field(default_factory=list)
+    pruned: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)  # Symlinks to the other form of an addon, module or package.
+    conflicts: list[str] = field(default_factory=list)  # Other forms which are not symlinks, left in place.
+
+
 class SymlinkToAddonSource:
     """Symlink creator."""
     def __init__(self, addons_install_dir: Path) -> None:
@@ -26,3 +41,87 @@ class SymlinkToAddonSource:
         symlink.symlink_to(addon_path)
 
         return symlink
+
+    @staticmethod
+    def _remove_entry(entry: os.DirEntry) -> None:
+        """Remove an entry from the addons directory without following symlinks.
+
+        Args:
+            entry: The entry to remove.
+        """
+
+        if entry.is_dir(follow_symlinks=False):
+            shutil.rmtree(entry.path)
+        else:
+            os.unlink(entry.path)
+
+    @staticmethod
+    def _links_to(entry: os.DirEntry, target: Path) -> bool:
+        """Check that an entry is a symlink resolving to the target.
+
+        Args:
+            entry: The entry to check.
+            target: The expected symlink target.
+        """
+
+        if not entry.is_symlink():
+            return False
+
+        link = Path(os.readlink(entry.path))
+        if not link.is_absolute():
+            link = Path(entry.path).parent / link
+
+        return os.path.realpath(link) == os.path.realpath(target)
+
+    def reconcile(self, addon_paths: list[Path], prune: bool = False) -> ReconcileResult:
+        """Bring the addons installation folder in line with the addon sources, touching only what differs.
+
+        Args:
+            addon_paths: Source paths of the addons that should be linked.
+            prune: Also remove dangling symlinks, such as those left behind by renamed or removed addons.
+
+        Returns:
+            The names of the entries that were created, replaced, left unchanged, pruned and removed,
+            and of the entries left in place because they conflict with an addon.
+        """
+
+        result = ReconcileResult()
+
+        with os.scandir(self.addons_install_dir) as it:
+            entries = {entry.name: entry for entry in it}
+
+        for addon_path in addon_paths:
+            # Relative links would resolve against the addons folder rather than the working directory.
+            addon_path = addon_path.absolute()
+            name = addon_path.name
+            entry = entries.pop(name, None)
+
+            # An addon that switched between module and package leaves its other form behind.
+            # Only links are removed, a real file or folder under the other name may hold user data.
+            other_name = addon_path.stem if addon_path.suffix == ".py" else f"{name}.py"
+            stale = entries.pop(other_name, None)
+            if stale and stale.is_symlink():
+                os.unlink(stale.path)
+                result.removed.append(other_name)
+            elif stale:
+                result.conflicts.append(other_name)
+
+            if entry and self._links_to(entry, addon_path):
+                result.unchanged.append(name)
+                continue
+
+            if entry:
+                self._remove_entry(entry)
+                result.replaced.append(name)
+            else:
+                result.created.append(name)
+
+            self.create_symlink(addon_path)
+
+        if prune:
+            for name, entry in entries.items():
+                if entry.is_symlink() and not os.path.exists(entry.path):
+                    os.unlink(entry.path)
+                    result.pruned.append(name)
+
+        return result
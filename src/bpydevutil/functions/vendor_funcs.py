@@ -0,0 +1,211 @@
+"""Vendor third-party packages into addons from a local wheelhouse, through a content-addressed extraction cache."""
+import hashlib
+import os
+import re
+import shutil
+import stat
+import tempfile
+from pathlib import Path, PurePosixPath
+from typing import Any, Optional
+from zipfile import ZipFile
+
+from bpydevutil.functions.pack_funcs import CHUNK_SIZE
+
+
+def normalize_name(name: str) -> str:
+    """Normalise a distribution name the way wheel filenames do.
+
+    Args:
+        name: Project or distribution name.
+
+    Returns:
+        The lower case name with runs of "-", "_" and "." replaced by "_".
+    """
+    return re.sub(r"[-_.]+", "_", name).lower()
+
+
+def default_cache_dir() -> Path:
+    """Get the default location of the extraction cache."""
+    return Path.home() / ".cache" / "bpydevutil" / "wheels"
+
+
+class VendorWheels:
+    """Find wheels in a local wheelhouse, extract each one once and place the files inside addons."""
+
+    def __init__(
+        self,
+        wheelhouse: Optional[Path],
+        requirements: dict[str, list[str]],
+        cache_dir: Path = None,
+        target: str = "libs",
+        hardlink: bool = False,
+    ) -> None:
+        """
+        Args:
+            wheelhouse: Directory containing the wheel files, only required once a package is vendored.
+            requirements: Addon names and the packages to vendor into each of them, eg "requests==2.28.1".
+            cache_dir: Directory where extracted wheels are stored.
+            target: Folder inside the addon where packages are placed.
+            hardlink: Hard link files from the cache into installed addons instead of copying them.
+                The linked files are read-only, as they are shared with every other addon using the wheel.
+        """
+        self.wheelhouse = Path(wheelhouse) if wheelhouse else None
+        self.requirements = requirements
+        self.cache_dir = Path(cache_dir) if cache_dir else default_cache_dir()
+        self.target = target
+        self.hardlink = hardlink
+
+    @classmethod
+    def from_config(cls, vendor_config: Optional[dict[str, Any]], root: Path = None) -> Optional["VendorWheels"]:
+        """Create an instance from the [tool.bpydevutil.vendor] section of a config file.
+
+        Args:
+            vendor_config: The vendor section.
+            root: Directory relative paths in the section are resolved against, defaults to the working directory.
+
+        Returns:
+            The instance, None if there is no vendor section.
+        """
+        if not vendor_config:
+            return None
+
+        root = Path(root) if root else Path.cwd()
+        wheelhouse = vendor_config.get("wheelhouse")
+        cache_dir = vendor_config.get("cache-dir")
+
+        # Checked by find_wheel, a broken section must not stop commands which never vendor.
+        return cls(
+            root / wheelhouse if wheelhouse else None,
+            vendor_config.get("addons", {}),
+            root / cache_dir if cache_dir else None,
+            vendor_config.get("target", "libs"),
+            bool(vendor_config.get("hardlink", False)),
+        )
+
+    def find_wheel(self, requirement: str) -> Path:
+        """Find the wheel satisfying a requirement in the wheelhouse.
+
+        Args:
+            requirement: Package name, optionally pinned with "==".
+
+        Returns:
+            Path to the wheel, the highest version if several match.
+
+        Raises:
+            ValueError: No wheelhouse is configured.
+            FileNotFoundError: The wheelhouse does not exist or has no matching wheel.
+        """
+        if self.wheelhouse is None:
+            raise ValueError("<vendor.wheelhouse> must be set to vendor packages.")
+        if not self.wheelhouse.is_dir():
+            raise FileNotFoundError(f"<vendor.wheelhouse> <{self.wheelhouse}> is not an existing directory.")
+
+        name, _, version = requirement.partition("==")
+        name = normalize_name(name.strip())
+        version = version.strip()
+
+        matches = []
+        for wheel in self.wheelhouse.glob("*.whl"):
+            parts = wheel.stem.split("-")
+            if len(parts) < 5:
+                continue
+
+            wheel_name, wheel_version = parts[:2]
+            if normalize_name(wheel_name) == name and (not version or wheel_version == version):
+                key = tuple(int(part) if part.isdigit() else -1 for part in re.split(r"[.+]", wheel_version))
+                matches.append((key, wheel))
+
+        if not matches:
+            raise FileNotFoundError(f"No wheel for <{requirement}> in the wheelhouse <{self.wheelhouse}>.")
+
+        return max(matches)[1]
+
+    def extract(self, wheel: Path) -> Path:
+        """Extract a wheel into the cache unless an identical wheel was extracted before.
+
+        Args:
+            wheel: Path to the wheel.
+
+        Returns:
+            The directory holding the extracted files.
+        """
+        digest = hashlib.sha256()
+        with open(wheel, "rb") as f:
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                digest.update(chunk)
+
+        extracted = self.cache_dir / digest.hexdigest()
+        if extracted.is_dir():
+            return extracted
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(prefix=".extract-", dir=self.cache_dir))
+        try:
+            with ZipFile(wheel) as wheel_file:
+                wheel_file.extractall(staging)
+            # Cached files are shared by every addon using the wheel, writing to them must fail rather than spread.
+            for path in staging.rglob("*"):
+                if path.is_file():
+                    path.chmod(stat.S_IMODE(path.stat().st_mode) & ~0o222)
+            # Renaming is atomic, a concurrent extraction of the same wheel simply loses the race.
+            os.rename(staging, extracted)
+        except OSError:
+            if not extracted.is_dir():
+                raise
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+        return extracted
+
+    def get_vendored_files(self, addon_path: Path) -> dict[PurePosixPath, Path]:
+        """Collect the files to be placed inside an addon.
+
+        Args:
+            addon_path: The addon source or installation path.
+
+        Returns:
+            Paths relative to the addon folder and the cached files they come from.
+        """
+        requirements = self.requirements.get(addon_path.stem, [])
+        if requirements and not addon_path.is_dir():
+            raise ValueError(f"<{addon_path.name}> is a single module, packages can only be vendored into folders.")
+
+        files = {}
+        for requirement in requirements:
+            extracted = self.extract(self.find_wheel(requirement))
+            for path in extracted.rglob("*"):
+                relative = path.relative_to(extracted)
+                # Scripts and headers in the .data folder are meant for an environment, not an import path.
+                if path.is_dir() or relative.parts[0].endswith(".data"):
+                    continue
+                files[PurePosixPath(self.target, *relative.parts)] = path
+
+        return files
+
+    def link_into(self, addon_dir: Path, files: Optional[dict[PurePosixPath, Path]] = None) -> int:
+        """Copy vendored files into an installed addon, or hard link them where enabled and possible.
+
+        Args:
+            addon_dir: The installed addon folder.
+            files: Files from get_vendored_files, collected again if not supplied.
+
+        Returns:
+            Number of files placed.
+        """
+        if files is None:
+            files = self.get_vendored_files(addon_dir)
+
+        for relative, src in files.items():
+            dst = addon_dir / relative
+            dst.parent.mkdir(parents=True, exist_ok=True)
+            dst.unlink(missing_ok=True)
+            if self.hardlink:
+                try:
+                    os.link(src, dst)
+                    continue
+                except OSError:
+                    pass
+            # Copy the contents only, the read-only mode of the cached file should not follow it.
+            shutil.copyfile(src, dst)
+
+        return len(files)
@@ -0,0 +1,99 @@
+"""Process many addon projects in one invocation, scheduling every addon through a shared worker pool."""
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Optional
+
+from bpydevutil.api import Job
+from bpydevutil.functions import common_funcs
+from bpydevutil.functions.vendor_funcs import VendorWheels
+
+# Config keys holding the directory each operation writes to.
+TARGET_KEYS = {"install": "blender-addons-dir", "symlink": "blender-addons-dir", "pack": "output-dir"}
+
+
+@dataclass
+class Project:
+    """An addon project with its own [tool.bpydevutil] section."""
+
+    root: Path
+    config: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def name(self) -> str:
+        """Name of the project folder."""
+        return self.root.name
+
+    def get_path(self, key: str) -> Optional[Path]:
+        """Get a directory from the project config, resolved against the project root.
+
+        Args:
+            key: The config key.
+
+        Returns:
+            The resolved path, None if the key is not set.
+        """
+        value = self.config.get(key)
+        return (self.root / value).resolve() if value else None
+
+
+def load_workspace(workspace_config: dict[str, Any], root: Path) -> list[Project]:
+    """Find the projects listed in a [tool.bpydevutil.workspace] section.
+
+    Args:
+        workspace_config: The workspace section.
+        root: Directory the project paths are relative to.
+
+    Returns:
+        The projects with a pyproject.toml, in the order they are listed. Glob patterns are expanded.
+    """
+    projects = []
+    seen = set()
+
+    for pattern in workspace_config.get("projects", []):
+        matches = sorted(root.glob(pattern)) if any(c in pattern for c in "*?[") else [root / pattern]
+        for project_root in matches:
+            project_root = project_root.resolve()
+            toml_path = project_root / "pyproject.toml"
+            if project_root in seen or not toml_path.is_file():
+                continue
+
+            seen.add(project_root)
+            projects.append(Project(project_root, common_funcs.parse_toml_section(toml_path)))
+
+    return projects
+
+
+def build_jobs(projects: list[Project], operation: str) -> tuple[list[Job], list[str]]:
+    """Build one job per project.
+
+    Args:
+        projects: The workspace projects.
+        operation: "install", "symlink" or "pack".
+
+    Returns:
+        The jobs.
+        Messages for projects which are missing the directories the operation needs.
+    """
+    jobs, skipped = [], []
+
+    for project in projects:
+        src_dir = project.get_path("src-dir")
+        target_dir = project.get_path(TARGET_KEYS[operation])
+        if not src_dir or not target_dir:
+            skipped.append(f"<{project.name}> does not set <src-dir> and <{TARGET_KEYS[operation]}>.")
+            continue
+
+        jobs.append(
+            Job(
+                operation,
+                src_dir,
+                target_dir,
+                excluded_addons=project.config.get("excluded-addons") or [],
+                remove_suffixes=project.config.get("remove-suffixes"),
+                reproducible=bool(project.config.get("reproducible")),
+                vendor=VendorWheels.from_config(project.config.get("vendor"), project.root),
+                label=project.name,
+            )
+        )
+
+    return jobs, skipped
@@ -1,15 +1,71 @@
 """Command line functionality."""
 
+import os
+import sys
+import time
 from pathlib import Path
 from typing import Optional
 
 import typer
-from rich import panel, print, progress
-
-from bpydevutil.functions import common_funcs, install_funcs, pack_funcs, symlink_funcs
+from rich import filesize, markup, panel, print, progress, table
+
+from bpydevutil import api
+from bpydevutil.functions import (
+    common_funcs,
+    install_funcs,
+    pack_funcs,
+    perf_funcs,
+    reload_funcs,
+    runner_funcs,
+    serve_funcs,
+    symlink_funcs,
+    vendor_funcs,
+    workspace_funcs,
+)
 
 app = typer.Typer()
+workspace_app = typer.Typer(help="Run a command over every project listed in a workspace.")
+app.add_typer(workspace_app, name="workspace")
+perf_app = typer.Typer(help="Inspect the performance history of install, symlink and pack runs.")
+app.add_typer(perf_app, name="perf")
 config = common_funcs.get_toml()
+daemon_socket = common_funcs.parse_toml(config, "daemon-socket")
+vendor = vendor_funcs.VendorWheels.from_config(common_funcs.parse_toml(config, "vendor"), Path(config).parent)
+perf_ledger = common_funcs.parse_toml(config, "perf-ledger")
+
+
+def get_vendored_files(addon: Path) -> dict:
+    """Get the vendored files of an addon, aborting with a message if the wheelhouse cannot provide them.
+
+    Args:
+        addon: The addon source or installation path.
+
+    Returns:
+        Paths relative to the addon folder and the cached files they come from.
+    """
+    if not vendor:
+        return {}
+
+    try:
+        return vendor.get_vendored_files(addon)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"[red]{e}[/red]")
+        raise typer.Abort()
+
+
+def record_perf(recorder: perf_funcs.PerfRecorder) -> None:
+    """Append a run to the performance ledger, unless it is disabled with <perf-ledger = false>.
+
+    Args:
+        recorder: The recorder of the run.
+    """
+    if perf_ledger is False:
+        return
+
+    try:
+        perf_funcs.PerfLedger(Path(perf_ledger or perf_funcs.DEFAULT_LEDGER)).append(recorder.to_record())
+    except OSError as e:
+        print(f"[dark_orange]Could not record performance: {e}[/dark_orange]")
 
 
 @app.command()
@@ -29,6 +85,10 @@ def symlink(
     reload_blender: Optional[bool] = typer.Argument(
         common_funcs.parse_toml(config, "reload-blender"), help="Restart Blender and enable addons."
     ),
+    prune: Optional[bool] = typer.Option(
+        default=common_funcs.parse_toml(config, "prune-symlinks"),
+        help="Remove dangling symlinks left behind by renamed or removed addons.",
+    ),
 ) -> None:
     """Create symlinks between addon sources and addon installation directory.
 
@@ -38,6 +98,7 @@ def symlink(
         excluded_addons: List of addon names to ignore.
         blender_exe: Path to blender.exe.
         reload_blender: Restart Blender and enable addons.
+        prune: Remove dangling symlinks left behind by renamed or removed addons.
     """
 
     def format_parameters() -> str:
@@ -47,9 +108,17 @@ def symlink(
         excluded_addons_string = f"Excluded Addons = {excluded_addons}"
         blender_exe_string = f"Blender Executable = {blender_exe}"
         reload_blender_string = f"Reload Blender = {reload_blender}"
+        prune_string = f"Prune Dangling Symlinks = {prune}"
 
         return "\n".join(
-            [src_string, addons_install_string, excluded_addons_string, blender_exe_string, reload_blender_string]
+            [
+                src_string,
+                addons_install_string,
+                excluded_addons_string,
+                blender_exe_string,
+                reload_blender_string,
+                prune_string,
+            ]
         )
 
     print(panel.Panel.fit(format_parameters(), title="[orange3]Symlink Tool Settings[/orange3]", border_style="yellow"))
@@ -57,18 +126,28 @@ def symlink(
     directory_params = {"src-dir": src_dir, "blender-addons-dir": blender_addons_dir}
     common_funcs.check_directories(directory_params)
 
+    recorder = perf_funcs.PerfRecorder("symlink", Path(src_dir))
     symlink_tool = symlink_funcs.SymlinkToAddonSource(Path(blender_addons_dir))
-    addon_srcs = common_funcs.get_addon_srcs(Path(src_dir), excluded_addons)
+    with recorder.phase("scan"):
+        addon_srcs = serve_funcs.get_addon_srcs(Path(src_dir), excluded_addons, daemon_socket)
 
-    for addon in progress.track(addon_srcs, description="Removing old files..."):
-        common_funcs.clear_old_addon(Path(blender_addons_dir), addon.name)
+    try:
+        with recorder.phase("reconcile"):
+            result = symlink_tool.reconcile(addon_srcs, bool(prune))
+    except PermissionError:
+        print("[red]You do not have permission to create symlinks.[/red]")
+        raise typer.Abort()
 
-    for addon in progress.track(addon_srcs, description="Creating symlinks..."):
-        try:
-            symlink_tool.create_symlink(addon)
-        except PermissionError:
-            print("[red]You do not have permission to create symlinks.[/red]")
-            typer.Abort()
+    recorder.addons = len(addon_srcs)
+    recorder.files = len(result.created) + len(result.replaced)
+    record_perf(recorder)
+
+    print(
+        f"[green]Symlinks:[/green] {len(result.created)} created, {len(result.replaced)} replaced, "
+        f"{len(result.unchanged)} unchanged, {len(result.pruned)} pruned, {len(result.removed)} removed."
+    )
+    for name in result.conflicts:
+        print(f"[dark_orange]<{name}> is not a symlink and conflicts with an addon, left in place.[/dark_orange]")
 
     if reload_blender:
         common_funcs.load_blender(blender_exe, [path.stem for path in addon_srcs])
@@ -128,18 +207,36 @@ def install(
     directory_params = {"src-dir": src_dir, "blender-addons-dir": blender_addons_dir}
     common_funcs.check_directories(directory_params)
 
+    recorder = perf_funcs.PerfRecorder("install", Path(src_dir))
     install_tool = install_funcs.InstallAddonsFromSource(Path(blender_addons_dir))
-    addon_srcs = common_funcs.get_addon_srcs(Path(src_dir), excluded_addons)
-
-    for addon in progress.track(addon_srcs, description="Removing old files..."):
-        common_funcs.clear_old_addon(Path(blender_addons_dir), addon.name)
-
-    for addon in progress.track(addon_srcs, description="Installing addons..."):
-        try:
-            install_tool.install_addon(addon)
-        except PermissionError:
-            print("[red]You do not have permission to install files in this directory.[/red]")
-            typer.Abort()
+    with recorder.phase("scan"):
+        addon_srcs = serve_funcs.get_addon_srcs(Path(src_dir), excluded_addons, daemon_socket)
+
+    with recorder.phase("clear"):
+        for addon in progress.track(addon_srcs, description="Removing old files..."):
+            common_funcs.clear_old_addon(Path(blender_addons_dir), addon.name)
+
+    with recorder.phase("install"):
+        for addon in progress.track(addon_srcs, description="Installing addons..."):
+            try:
+                install_tool.install_addon(addon)
+            except PermissionError:
+                print("[red]You do not have permission to install files in this directory.[/red]")
+                typer.Abort()
+            recorder.files += common_funcs.count_files(addon)
+            recorder.bytes += pack_funcs.PackAddonsFromSource.get_pack_size(addon)
+
+    if vendor:
+        with recorder.phase("vendor"):
+            for addon in progress.track(addon_srcs, description="Vendoring packages..."):
+                vendored_files = get_vendored_files(addon)
+                if vendored_files:
+                    vendor.link_into(Path(blender_addons_dir) / addon.name, vendored_files)
+                    recorder.files += len(vendored_files)
+                    recorder.bytes += sum(path.stat().st_size for path in vendored_files.values())
+
+    recorder.addons = len(addon_srcs)
+    record_perf(recorder)
 
     if reload_blender:
         common_funcs.load_blender(blender_exe, [path.stem for path in addon_srcs])
@@ -165,6 +262,13 @@ def pack(
         default=common_funcs.parse_toml(config, "remove-suffixes"),
         help="Remove files with these suffixes from the addon source before running the operation.",
     ),
+    delta_from: Optional[str] = typer.Option(
+        default=None, help="Previous release ZIP file to build a delta package against."
+    ),
+    reproducible: Optional[bool] = typer.Option(
+        default=common_funcs.parse_toml(config, "reproducible"),
+        help="Build byte-identical archives from identical sources, timestamps come from SOURCE_DATE_EPOCH.",
+    ),
 ) -> None:
     """Pack addons into zip files and automatically generate names using bl_info.
 
@@ -173,6 +277,8 @@ def pack(
         output_dir: ZIP file output directory.
         excluded_addons: List of addon names to ignore.
         remove_suffixes: Remove any files with these suffixes before packing.
+        delta_from: Previous release ZIP file to build a delta package against.
+        reproducible: Build byte-identical archives from identical sources.
     """
 
     def format_parameters() -> str:
@@ -181,25 +287,530 @@ def pack(
         output_dir_string = f"Output Directory = {output_dir}"
         excluded_addons_string = f"Excluded Addons = {excluded_addons}"
         remove_suffixes_string = f"Remove Suffixes = {remove_suffixes}"
+        delta_from_string = f"Delta From = {delta_from}"
+        reproducible_string = f"Reproducible = {reproducible}"
 
-        return "\n".join([src_string, output_dir_string, excluded_addons_string, remove_suffixes_string])
+        return "\n".join(
+            [
+                src_string,
+                output_dir_string,
+                excluded_addons_string,
+                remove_suffixes_string,
+                delta_from_string,
+                reproducible_string,
+            ]
+        )
 
     print(panel.Panel.fit(format_parameters(), title="[orange3]Packing Tool Settings[/orange3]", border_style="yellow"))
 
     directory_params = {"src-dir": src_dir, "output-dir": output_dir}
     common_funcs.check_directories(directory_params)
 
+    recorder = perf_funcs.PerfRecorder("pack", Path(src_dir))
     packing_tool = pack_funcs.PackAddonsFromSource(Path(output_dir))
-    addon_srcs = common_funcs.get_addon_srcs(Path(src_dir), excluded_addons)
+    with recorder.phase("scan"):
+        addon_srcs = serve_funcs.get_addon_srcs(Path(src_dir), excluded_addons, daemon_socket)
+        zip_names = {
+            addon: packing_tool.generate_zip_name(serve_funcs.get_addon_data(addon, daemon_socket))
+            for addon in addon_srcs
+        }
+
+    if delta_from:
+        if not Path(delta_from).is_file():
+            raise typer.BadParameter(f"<delta-from> <{delta_from}> is not an existing file.")
+        if len(addon_srcs) != 1:
+            print("[red]<delta-from> can only be used when packing a single addon, exclude the others.[/red]")
+            raise typer.Abort()
+        if Path(delta_from).resolve() == (Path(output_dir) / f"{zip_names[addon_srcs[0]]}.zip").resolve():
+            print(
+                f"[red]<delta-from> <{delta_from}> would be overwritten by the new release, "
+                "bump the addon version or move the previous release out of the output directory.[/red]"
+            )
+            raise typer.Abort()
+
+    if reproducible:
+        try:
+            packing_tool.get_source_date()
+        except ValueError as e:
+            print(f"[red]{e}[/red]")
+            raise typer.Abort()
 
     total_files_cleared = 0
-    for addon in progress.track(addon_srcs, description="Packing addons..."):
-        bl_info = packing_tool.get_addon_data(addon)
-        name = packing_tool.generate_zip_name(bl_info)
-        files_cleared = common_funcs.clear_unused_files(addon, remove_suffixes)
-        total_files_cleared += files_cleared
-        packing_tool.pack_addon(addon, name, Path(src_dir))
+    total_bytes_cleared = 0
+    vendored_files = {}
+    with recorder.phase("prepare"):
+        for addon in addon_srcs:
+            vendored_files[addon] = get_vendored_files(addon)
+            cleanup = common_funcs.clear_unused_files(addon, remove_suffixes)
+            total_files_cleared += cleanup.files
+            total_bytes_cleared += cleanup.bytes
+
+        total_bytes = sum(packing_tool.get_pack_size(addon) for addon in addon_srcs)
+        total_bytes += sum(path.stat().st_size for files in vendored_files.values() for path in files.values())
+    byte_progress = progress.Progress(
+        progress.TextColumn("[progress.description]{task.description}"),
+        progress.BarColumn(),
+        progress.DownloadColumn(),
+        progress.TransferSpeedColumn(),
+        progress.TimeRemainingColumn(),
+    )
+
+    with byte_progress, recorder.phase("pack"):
+        task = byte_progress.add_task("Packing addons...", total=total_bytes)
+        for addon in addon_srcs:
+            byte_progress.update(task, description=f"Packing {addon.name}...")
+            packing_tool.pack_addon(
+                addon,
+                zip_names[addon],
+                Path(src_dir),
+                lambda n: byte_progress.advance(task, n),
+                bool(reproducible),
+                vendored_files[addon],
+            )
+        byte_progress.update(task, description="Packing addons...")
+
+    if delta_from:
+        new_zip = Path(output_dir) / f"{zip_names[addon_srcs[0]]}.zip"
+        with recorder.phase("delta"):
+            delta_path, manifest = packing_tool.pack_delta(Path(delta_from), new_zip)
+        print(
+            f"[green]Delta Package:[/green] {delta_path.name}, {len(manifest['added'])} added, "
+            f"{len(manifest['changed'])} changed, {len(manifest['removed'])} removed "
+            f"({delta_path.stat().st_size} of {new_zip.stat().st_size} bytes)."
+        )
+
+    recorder.addons = len(addon_srcs)
+    recorder.files = sum(common_funcs.count_files(addon) + len(vendored_files[addon]) for addon in addon_srcs)
+    recorder.bytes = total_bytes
+    record_perf(recorder)
 
     if total_files_cleared > 0:
-        print(f"[green]Garbage Cleaning:[/green] {total_files_cleared} files removed.")
+        print(
+            f"[green]Garbage Cleaning:[/green] {total_files_cleared} files removed, "
+            f"{filesize.decimal(total_bytes_cleared)} reclaimed."
+        )
+    print("[green]Done![/green]")
+
+
+@app.command()
+def clean(
+    src_dir: str = typer.Argument(
+        common_funcs.parse_toml(config, "src-dir"), help="Directory where addon sources are located."
+    ),
+    excluded_addons: Optional[list[str]] = typer.Argument(
+        common_funcs.parse_toml(config, "excluded-addons"), help="List of addons to ignore."
+    ),
+    remove_suffixes: Optional[list[str]] = typer.Option(
+        default=common_funcs.parse_toml(config, "remove-suffixes"),
+        help="Remove files with these suffixes from the addon source.",
+    ),
+    dry_run: bool = typer.Option(default=False, help="Only list what would be removed."),
+) -> None:
+    """Remove __pycache__ folders and unwanted file types from addon sources.
+
+    Args:
+        src_dir: Directory where addon sources are located.
+        excluded_addons: List of addon names to ignore.
+        remove_suffixes: Remove any files with these suffixes.
+        dry_run: Only list what would be removed.
+    """
+    directory_params = {"src-dir": src_dir}
+    common_funcs.check_directories(directory_params)
+
+    addon_srcs = serve_funcs.get_addon_srcs(Path(src_dir), excluded_addons, daemon_socket)
+
+    total_files, total_bytes = 0, 0
+    for addon in progress.track(addon_srcs, description="Cleaning addons..."):
+        cleanup = common_funcs.clear_unused_files(addon, remove_suffixes, dry_run)
+        total_files += cleanup.files
+        total_bytes += cleanup.bytes
+        if dry_run:
+            for path in cleanup.paths:
+                print(f"[italic]Would remove <{path}>[/italic]")
+
+    action = "would be removed" if dry_run else "removed"
+    print(f"[green]Garbage Cleaning:[/green] {total_files} files {action}, {filesize.decimal(total_bytes)}.")
+
+
+@app.command()
+def apply_delta(
+    base_zip: str = typer.Argument(..., help="Previous release ZIP file the delta package was built against."),
+    delta_zip: str = typer.Argument(..., help="Delta package ZIP file."),
+    output_zip: str = typer.Argument(..., help="Path of the rebuilt release ZIP file."),
+) -> None:
+    """Rebuild a release from the previous release and a delta package.
+
+    Args:
+        base_zip: Previous release ZIP file the delta package was built against.
+        delta_zip: Delta package ZIP file.
+        output_zip: Path of the rebuilt release ZIP file.
+    """
+    for param, value in {"base-zip": base_zip, "delta-zip": delta_zip}.items():
+        if not Path(value).is_file():
+            raise typer.BadParameter(f"<{param}> <{value}> is not an existing file.")
+
+    manifest = pack_funcs.PackAddonsFromSource.apply_delta(Path(base_zip), Path(delta_zip), Path(output_zip))
+
+    print(
+        f"[green]Done![/green] <{manifest['target']}> rebuilt as <{output_zip}>, "
+        f"{len(manifest['added']) + len(manifest['changed'])} files updated, {len(manifest['removed'])} removed."
+    )
+
+
+@app.command()
+def reload(
+    changed_files: list[str] = typer.Argument(..., help="Source files that changed."),
+    src_dir: str = typer.Option(
+        default=common_funcs.parse_toml(config, "src-dir"), help="Directory where addon sources are located."
+    ),
+    excluded_addons: Optional[list[str]] = typer.Option(
+        default=common_funcs.parse_toml(config, "excluded-addons"), help="List of addons to ignore."
+    ),
+    output: Optional[str] = typer.Option(default=None, help="Write the reload script to this file."),
+) -> None:
+    """Generate a script which reloads only the addon modules affected by changed files inside a running Blender.
+
+    Args:
+        changed_files: Source files that changed.
+        src_dir: Directory where addon sources are located.
+        excluded_addons: List of addon names to ignore.
+        output: Write the reload script to this file instead of the console.
+    """
+    directory_params = {"src-dir": src_dir}
+    common_funcs.check_directories(directory_params)
+
+    addon_srcs = serve_funcs.get_addon_srcs(Path(src_dir), excluded_addons, daemon_socket)
+    modules, addons, unmatched = reload_funcs.plan_reload(addon_srcs, [Path(file) for file in changed_files])
+
+    for file in unmatched:
+        print(f"[italic]Skipping <{file}>, it is not an addon module.[/italic]", file=sys.stderr)
+
+    if not modules:
+        print("[dark_orange]Nothing to reload.[/dark_orange]", file=sys.stderr)
+        return
+
+    script = reload_funcs.build_reload_script(modules, addons)
+
+    if output:
+        Path(output).write_text(script)
+        print(f"[green]Done![/green] Reload script for {len(modules)} modules written to <{output}>.")
+    else:
+        # Plain echo so the script can be piped straight into Blender without console markup.
+        typer.echo(script)
+
+
+@app.command("test")
+def run_tests(
+    src_dir: str = typer.Argument(
+        common_funcs.parse_toml(config, "src-dir"), help="Directory where addon sources are located."
+    ),
+    tests_dir: str = typer.Option(
+        default=common_funcs.parse_toml(config, "tests-dir") or "tests", help="Directory containing test modules."
+    ),
+    workers: int = typer.Option(default=os.cpu_count() or 1, help="Number of warm interpreter workers."),
+    blender_exe: Optional[str] = typer.Option(
+        default=common_funcs.parse_toml(config, "blender-exe"),
+        help="Path to blender.exe, the current Python interpreter is used if not set.",
+    ),
+    junit_xml: str = typer.Option(default="test-results.xml", help="Path of the JUnit XML report."),
+    durations_file: str = typer.Option(
+        default=".bpydevutil/test-durations.json", help="Historical module durations used to balance workers."
+    ),
+    timeout: float = typer.Option(
+        default=common_funcs.parse_toml(config, "test-timeout") or 300,
+        help="Seconds a worker may take to start or to run one test module, 0 for no limit.",
+    ),
+) -> None:
+    """Run addon unit tests across a pool of warm Blender or Python workers.
+
+    Args:
+        src_dir: Directory where addon sources are located.
+        tests_dir: Directory containing test modules.
+        workers: Number of warm interpreter workers.
+        blender_exe: Path to blender.exe, the current Python interpreter is used if not set.
+        junit_xml: Path of the JUnit XML report.
+        durations_file: Historical module durations used to balance workers.
+        timeout: Seconds a worker may take to start or to run one test module, 0 for no limit.
+    """
+
+    def format_parameters() -> str:
+        """Format parameters for printing in the console."""
+        src_string = f"Addon Sources Directory = {src_dir}"
+        tests_dir_string = f"Tests Directory = {tests_dir}"
+        workers_string = f"Workers = {workers}"
+        blender_exe_string = f"Blender Executable = {blender_exe}"
+        junit_xml_string = f"JUnit XML Report = {junit_xml}"
+        timeout_string = f"Timeout = {timeout}"
+
+        return "\n".join(
+            [src_string, tests_dir_string, workers_string, blender_exe_string, junit_xml_string, timeout_string]
+        )
+
+    print(panel.Panel.fit(format_parameters(), title="[orange3]Test Runner Settings[/orange3]", border_style="yellow"))
+
+    directory_params = {"src-dir": src_dir, "tests-dir": tests_dir}
+    common_funcs.check_directories(directory_params)
+
+    addon_srcs = serve_funcs.get_addon_srcs(Path(src_dir), None, daemon_socket)
+    modules = runner_funcs.discover_test_modules(Path(tests_dir).resolve())
+    if not modules:
+        print(f"[red]There are no test modules inside the directory [{tests_dir}][/red]")
+        raise typer.Abort()
+
+    durations = runner_funcs.load_durations(Path(durations_file))
+    pool = runner_funcs.TestWorkerPool(
+        runner_funcs.build_worker_command(blender_exe),
+        workers,
+        [Path(src_dir).resolve(), Path(tests_dir).resolve()],
+        [addon.stem for addon in addon_srcs],
+        timeout or None,
+    )
+
+    with progress.Progress(progress.SpinnerColumn(), progress.TextColumn("{task.description}"), transient=True) as p:
+        p.add_task(f"Running {len(modules)} test modules on {min(workers, len(modules))} workers...")
+        try:
+            results = pool.run(modules, durations)
+        except RuntimeError as e:
+            print(f"[red]{markup.escape(str(e))}[/red]")
+            raise typer.Abort()
+
+    runner_funcs.save_durations(Path(durations_file), results, durations)
+    runner_funcs.write_junit_xml(results, Path(junit_xml))
+
+    failed = 0
+    for result in results:
+        for case in result.cases:
+            if case.status in ("failed", "error"):
+                failed += 1
+                print(f"[red]{case.status.upper()}[/red] {case.classname}.{case.name}: {case.message}")
+
+    passed = sum(result.count("passed") for result in results)
+    skipped = sum(result.count("skipped") for result in results)
+    print(f"[green]Tests:[/green] {passed} passed, {failed} failed, {skipped} skipped.")
+    print(f"Report written to <{junit_xml}>.")
+
+    if failed:
+        raise typer.Exit(1)
+
+    print("[green]Done![/green]")
+
+
+@app.command()
+def serve(
+    socket_path: Optional[str] = typer.Option(default=daemon_socket, help="Unix socket the daemon listens on."),
+    poll_interval: float = typer.Option(default=0.5, help="Seconds between checks for changed addon sources."),
+    stop: bool = typer.Option(default=False, help="Stop a running daemon instead of starting one."),
+) -> None:
+    """Run a resident daemon which keeps addon indexes warm between commands.
+
+    Args:
+        socket_path: Unix socket the daemon listens on.
+        poll_interval: Seconds between checks for changed addon sources.
+        stop: Stop a running daemon instead of starting one.
+    """
+    if not serve_funcs.daemon_supported():
+        print("[red]The daemon requires unix domain socket support, which this platform does not provide.[/red]")
+        raise typer.Abort()
+
+    socket_path = Path(socket_path) if socket_path else serve_funcs.default_socket_path()
+
+    if stop:
+        if serve_funcs.DaemonClient(socket_path).stop():
+            print("[green]Daemon stopped.[/green]")
+        else:
+            print(f"[dark_orange]No daemon is listening on <{socket_path}>.[/dark_orange]")
+        return
+
+    print(
+        panel.Panel.fit(
+            f"Socket = {socket_path}\nPoll Interval = {poll_interval}",
+            title="[orange3]Daemon Settings[/orange3]",
+            border_style="yellow",
+        )
+    )
+
+    try:
+        serve_funcs.AddonIndexServer(socket_path, poll_interval).serve_forever()
+    except RuntimeError as e:
+        print(f"[red]{e}[/red]")
+        raise typer.Abort()
+    except KeyboardInterrupt:
+        pass
+
+    print("[green]Done![/green]")
+
+
+def run_workspace(operation: str, workspace_file: Optional[str], max_workers: Optional[int]) -> None:
+    """Run an operation over every project in a workspace and print a summary.
+
+    Args:
+        operation: "install", "symlink" or "pack".
+        workspace_file: Toml file with the [tool.bpydevutil.workspace] section.
+        max_workers: Maximum number of addons processed at the same time across all projects.
+    """
+    toml_path = Path(workspace_file) if workspace_file else config
+    if not toml_path or not Path(toml_path).is_file():
+        raise typer.BadParameter("<workspace-file> must be an existing toml file.")
+
+    workspace_config = common_funcs.parse_toml(toml_path, "workspace")
+    if not workspace_config:
+        print(f"[red]There is no [tool.bpydevutil.workspace] section in <{toml_path}>.[/red]")
+        raise typer.Abort()
+
+    max_workers = max_workers or workspace_config.get("max-workers")
+    projects = workspace_funcs.load_workspace(workspace_config, Path(toml_path).parent)
+    jobs, skipped = workspace_funcs.build_jobs(projects, operation)
+
+    print(
+        panel.Panel.fit(
+            f"Workspace = {toml_path}\nProjects = {len(projects)}\nMax Workers = {max_workers}",
+            title=f"[orange3]Workspace {operation.capitalize()} Settings[/orange3]",
+            border_style="yellow",
+        )
+    )
+
+    for message in skipped:
+        print(f"[italic]Skipping {message}[/italic]")
+
+    with progress.Progress(progress.SpinnerColumn(), progress.TextColumn("{task.description}"), transient=True) as p:
+        p.add_task(f"Running {len(jobs)} projects...")
+        results = api.run_jobs(jobs, max_workers)
+
+    summary = table.Table("Project", "Addons", "Files", "Size", "Time", "Status")
+    failed = False
+    for result in results:
+        errors = [result.error] if result.error else [f"{a.addon}: {a.error}" for a in result.addons if a.error]
+        failed = failed or bool(errors)
+        status = "[red]" + "\n".join(errors) + "[/red]" if errors else "[green]OK[/green]"
+        if result.skipped:
+            status += f"\n[italic]{len(result.skipped)} shared addons skipped[/italic]"
+
+        summary.add_row(
+            result.job.label,
+            str(len(result.addons)),
+            str(result.files),
+            filesize.decimal(result.bytes),
+            f"{result.duration:.2f}s",
+            status,
+        )
+
+    print(summary)
+
+    if failed:
+        print("[red]Some projects failed.[/red]")
+        raise typer.Exit(1)
+
+    print("[green]Done![/green]")
+
+
+@workspace_app.command("install")
+def workspace_install(
+    workspace_file: Optional[str] = typer.Option(default=None, help="Toml file listing the workspace projects."),
+    max_workers: Optional[int] = typer.Option(default=None, help="Maximum number of addons installed at once."),
+) -> None:
+    """Install the addons of every workspace project.
+
+    Args:
+        workspace_file: Toml file listing the workspace projects, defaults to the working directory pyproject.toml.
+        max_workers: Maximum number of addons installed at once.
+    """
+    run_workspace("install", workspace_file, max_workers)
+
+
+@workspace_app.command("symlink")
+def workspace_symlink(
+    workspace_file: Optional[str] = typer.Option(default=None, help="Toml file listing the workspace projects."),
+    max_workers: Optional[int] = typer.Option(default=None, help="Maximum number of addons linked at once."),
+) -> None:
+    """Create symlinks for the addons of every workspace project.
+
+    Args:
+        workspace_file: Toml file listing the workspace projects, defaults to the working directory pyproject.toml.
+        max_workers: Maximum number of addons linked at once.
+    """
+    run_workspace("symlink", workspace_file, max_workers)
+
+
+@workspace_app.command("pack")
+def workspace_pack(
+    workspace_file: Optional[str] = typer.Option(default=None, help="Toml file listing the workspace projects."),
+    max_workers: Optional[int] = typer.Option(default=None, help="Maximum number of addons packed at once."),
+) -> None:
+    """Pack the addons of every workspace project.
+
+    Args:
+        workspace_file: Toml file listing the workspace projects, defaults to the working directory pyproject.toml.
+        max_workers: Maximum number of addons packed at once.
+    """
+    run_workspace("pack", workspace_file, max_workers)
+
+
+@perf_app.command("report")
+def perf_report(
+    ledger: str = typer.Option(
+        default=common_funcs.parse_toml(config, "perf-ledger") or perf_funcs.DEFAULT_LEDGER,
+        help="Performance ledger to read.",
+    ),
+    command: Optional[str] = typer.Option(default=None, help="Only show runs of this command."),
+    limit: int = typer.Option(default=20, min=1, help="Number of most recent runs to show."),
+    window: int = typer.Option(
+        default=common_funcs.parse_toml(config, "perf-window") or 10,
+        help="Number of previous runs the rolling baseline is taken from.",
+    ),
+    threshold: float = typer.Option(
+        default=common_funcs.parse_toml(config, "perf-threshold") or 0.25,
+        help="Fraction slower than the baseline at which a run is flagged, eg 0.25 for 25%.",
+    ),
+    openmetrics: Optional[str] = typer.Option(
+        default=None, help="Also export the latest runs as an OpenMetrics textfile for a node exporter."
+    ),
+) -> None:
+    """Show recent install, symlink and pack runs and flag those slower than their rolling baseline.
+
+    Args:
+        ledger: Performance ledger to read.
+        command: Only show runs of this command.
+        limit: Number of most recent runs to show.
+        window: Number of previous runs the rolling baseline is taken from.
+        threshold: Fraction slower than the baseline at which a run is flagged.
+        openmetrics: Path of an OpenMetrics textfile to export the latest runs to.
+    """
+    records = perf_funcs.PerfLedger(Path(ledger)).read()
+    if not records:
+        print(f"[red]There are no runs recorded in <{ledger}>.[/red]")
+        raise typer.Abort()
+
+    reports = perf_funcs.analyze(records, window, threshold)
+    if command:
+        reports = [report for report in reports if report.record["command"] == command]
+
+    summary = table.Table("Time", "Command", "Addons", "Files", "Size", "Duration", "Baseline", "Change")
+    for report in reports[-limit:]:
+        record = report.record
+        change = "" if report.change is None else f"{report.change:+.0%}"
+        if report.regression:
+            change = f"[red]{change}[/red]"
+
+        summary.add_row(
+            time.strftime("%Y-%m-%d %H:%M", time.localtime(record.get("time", 0))),
+            record["command"],
+            str(record.get("addons", "")),
+            str(record.get("files", "")),
+            filesize.decimal(record.get("bytes", 0)),
+            f"{record['duration']:.2f}s",
+            "" if report.baseline is None else f"{report.baseline:.2f}s",
+            change,
+        )
+
+    print(summary)
+
+    if openmetrics:
+        perf_funcs.write_openmetrics(reports, Path(openmetrics))
+        print(f"OpenMetrics written to <{openmetrics}>.")
+
+    regressions = sum(report.regression for report in reports[-limit:])
+    if regressions:
+        print(f"[red]{regressions} runs were more than {threshold:.0%} slower than their baseline.[/red]")
+        raise typer.Exit(1)
+
     print("[green]Done![/green]")
@@ -0,0 +1,46 @@
+"""Test the batch API."""
+
+import shutil
+from zipfile import ZipFile
+
+from bpydevutil import api
+
+
+def test_run_jobs(temp_projects_dir, tmp_path, capsys):
+    root_dir, modules, packages = temp_projects_dir
+    src_dir = tmp_path / "src"
+    shutil.copytree(root_dir / "src", src_dir)
+    valid = sorted([*(f"{k}.py" for k, v in modules.items() if v), *(k for k, v in packages.items() if v)])
+
+    for name in ("installed", "linked", "packed"):
+        (tmp_path / name).mkdir()
+
+    jobs = [
+        api.Job("install", src_dir, tmp_path / "installed"),
+        api.Job("symlink", src_dir, tmp_path / "linked", excluded_addons=["valid_module.py"]),
+        api.Job("pack", src_dir, tmp_path / "packed", remove_suffixes=[".tmp"]),
+        api.Job("install", src_dir, tmp_path / "missing"),
+        api.Job("unknown", src_dir, tmp_path),
+    ]
+    install, symlink, pack, missing, unknown = api.run_jobs(jobs, max_workers=4)
+
+    assert install.success
+    assert sorted(addon.addon for addon in install.addons) == valid
+    assert install.files > 0 and install.bytes > 0
+    assert all((tmp_path / "installed" / name).exists() for name in valid)
+
+    assert symlink.success
+    assert "valid_module.py" not in [addon.addon for addon in symlink.addons]
+
+    assert pack.success
+    for addon in pack.addons:
+        with ZipFile(addon.output) as f:
+            assert f.testzip() is None
+
+    assert not missing.success and "missing" in missing.error
+    assert not unknown.success and "unknown" in unknown.error
+
+    rerun = api.run_job(api.Job("install", src_dir, tmp_path / "installed"))
+    assert rerun.success
+
+    assert capsys.readouterr().out == ""
@@ -21,3 +21,22 @@ def test_clear_unused_files(temp_projects_dir):
     waste_files = list(arbitrary_package2.rglob("*.txt"))
     waste_files.extend(list(arbitrary_package2.rglob("*.tmp")))
     assert len(waste_files) == 0
+
+
+def test_clear_unused_files_report(tmp_path):
+    addon = tmp_path / "addon"
+    nested = addon / "pkg" / "__pycache__" / "nested"
+    nested.mkdir(parents=True)
+    (nested.parent / "mod.cpython-39.pyc").write_bytes(b"\0" * 10)
+    (nested / "inner.pyc").write_bytes(b"\0" * 5)
+    (addon / "notes.txt").write_bytes(b"\0" * 7)
+    (addon / "keep.py").write_text("")
+
+    report = common_funcs.clear_unused_files(addon, {".txt"}, dry_run=True)
+    assert (report.files, report.bytes) == (3, 22)
+    assert (addon / "notes.txt").exists() and nested.exists()
+
+    report = common_funcs.clear_unused_files(addon, {".txt"})
+    assert (report.files, report.bytes) == (3, 22)
+    assert not (addon / "notes.txt").exists() and not nested.parent.exists()
+    assert (addon / "keep.py").exists()
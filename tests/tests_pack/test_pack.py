@@ -1,7 +1,9 @@
 """Test packing of addon files."""
 
+import io
+import os
 from pathlib import Path
-from zipfile import ZipFile
+from zipfile import ZIP_DEFLATED, ZipFile
 
 import pytest
 import typer
@@ -60,3 +62,134 @@ class TestPackAddons:
                     assert Path(output_dir / name).with_suffix(".zip").is_file()
                     assert len(f.namelist()) == file_count
                 break
+
+    def test_pack_addon_progress(self, _setup):
+        instance, output_dir, src_dir, _, _ = _setup
+
+        addon = src_dir / "valid_package"
+        (addon / "payload.bin").write_bytes(b"\0" * (pack_funcs.CHUNK_SIZE * 2 + 10))
+
+        reported = []
+        instance.pack_addon(addon, "PackTest_Progress", src_dir, reported.append)
+        (addon / "payload.bin").unlink()
+
+        assert sum(reported) == instance.get_pack_size(addon) + pack_funcs.CHUNK_SIZE * 2 + 10
+        assert max(reported) <= pack_funcs.CHUNK_SIZE
+        with ZipFile(output_dir / "PackTest_Progress.zip") as f:
+            assert f.testzip() is None
+
+
+def test_pack_delta(tmp_path):
+    src_dir = tmp_path / "src"
+    addon = src_dir / "delta_addon"
+    addon.mkdir(parents=True)
+    (addon / "__init__.py").write_text("bl_info = {}")
+    (addon / "assets.bin").write_bytes(b"\1" * 4096)
+    (addon / "old.py").write_text("old = True")
+
+    instance = pack_funcs.PackAddonsFromSource(tmp_path)
+    instance.pack_addon(addon, "Delta (v1.0.0)", src_dir)
+
+    (addon / "old.py").unlink()
+    (addon / "new.py").write_text("new = True")
+    (addon / "__init__.py").write_text("bl_info = {'name': 'Delta'}")
+    instance.pack_addon(addon, "Delta (v1.1.0)", src_dir)
+
+    delta_path, manifest = instance.pack_delta(tmp_path / "Delta (v1.0.0).zip", tmp_path / "Delta (v1.1.0).zip")
+    assert manifest["added"] == ["delta_addon/new.py"]
+    assert manifest["changed"] == ["delta_addon/__init__.py"]
+    assert manifest["removed"] == ["delta_addon/old.py"]
+    with ZipFile(delta_path) as f:
+        assert "delta_addon/assets.bin" not in f.namelist()
+
+    rebuilt = tmp_path / "rebuilt.zip"
+    instance.apply_delta(tmp_path / "Delta (v1.0.0).zip", delta_path, rebuilt)
+    with ZipFile(rebuilt) as rebuilt_file, ZipFile(tmp_path / "Delta (v1.1.0).zip") as new_file:
+        assert sorted(rebuilt_file.namelist()) == sorted(new_file.namelist())
+        for name in new_file.namelist():
+            assert rebuilt_file.read(name) == new_file.read(name)
+
+    with pytest.raises(typer.Abort):
+        instance.apply_delta(tmp_path / "Delta (v1.0.0).zip", tmp_path / "Delta (v1.1.0).zip", rebuilt)
+
+    # Same member names as the real base, different contents.
+    (addon / "assets.bin").write_bytes(b"WRONG")
+    (addon / "old.py").write_text("old = True")
+    instance.pack_addon(addon, "Wrong Base", src_dir)
+    with pytest.raises(typer.Abort):
+        instance.apply_delta(tmp_path / "Wrong Base.zip", delta_path, tmp_path / "corrupt.zip")
+    assert not list(tmp_path.glob("*corrupt.zip*"))
+
+    # Rebuilding in place replaces the base only once the new release is complete.
+    base = tmp_path / "Delta (v1.0.0).zip"
+    instance.apply_delta(base, delta_path, base)
+    with ZipFile(base) as base_file, ZipFile(tmp_path / "Delta (v1.1.0).zip") as new_file:
+        assert sorted(base_file.namelist()) == sorted(new_file.namelist())
+        for name in new_file.namelist():
+            assert base_file.read(name) == new_file.read(name)
+
+
+def test_copy_member_size(tmp_path):
+    with ZipFile(tmp_path / "src.zip", "w") as f:
+        f.writestr("member.bin", b"\0" * 1024)
+
+    class RecordingZip:
+        opened = []
+
+        def open(self, info, mode):
+            self.opened.append(info.file_size)
+            return io.BytesIO()
+
+    with ZipFile(tmp_path / "src.zip") as src:
+        pack_funcs.PackAddonsFromSource.copy_member(src, src.getinfo("member.bin"), RecordingZip())
+
+    # ZipFile.open only reserves ZIP64 headers for members it knows the size of.
+    assert RecordingZip.opened == [1024]
+
+
+def test_pack_addon_reproducible(tmp_path, monkeypatch):
+    src_dir = tmp_path / "src"
+    addon = src_dir / "repro_addon"
+    (addon / "sub").mkdir(parents=True)
+    (addon / "__init__.py").write_text("bl_info = {}")
+    (addon / "sub" / "data.txt").write_text("data" * 100)
+
+    monkeypatch.setenv("SOURCE_DATE_EPOCH", "1700000000")
+    instance = pack_funcs.PackAddonsFromSource(tmp_path)
+    instance.pack_addon(addon, "first", src_dir, reproducible=True)
+
+    os.utime(addon / "__init__.py", (1, 1))
+    (addon / "sub" / "data.txt").chmod(0o600)
+    instance.pack_addon(addon, "second", src_dir, reproducible=True)
+
+    assert (tmp_path / "first.zip").read_bytes() == (tmp_path / "second.zip").read_bytes()
+    with ZipFile(tmp_path / "first.zip") as f:
+        names = f.namelist()
+        assert names == sorted(names)
+        assert all(info.date_time == (2023, 11, 14, 22, 13, 20) for info in f.infolist())
+
+
+def test_get_source_date(monkeypatch):
+    monkeypatch.setenv("SOURCE_DATE_EPOCH", "0")
+    assert pack_funcs.PackAddonsFromSource.get_source_date() == (1980, 1, 1, 0, 0, 0)
+
+    monkeypatch.setenv("SOURCE_DATE_EPOCH", "99999999999")
+    assert pack_funcs.PackAddonsFromSource.get_source_date() == (2107, 12, 31, 23, 59, 58)
+
+    monkeypatch.setenv("SOURCE_DATE_EPOCH", "yesterday")
+    with pytest.raises(ValueError):
+        pack_funcs.PackAddonsFromSource.get_source_date()
+
+
+def test_write_member_compress_level(tmp_path):
+    source = tmp_path / "data.txt"
+    source.write_text(" ".join(f"word{i * 7919 % 1000}" for i in range(50000)))
+
+    sizes = []
+    for level in (1, 9):
+        with ZipFile(tmp_path / f"level{level}.zip", "w", ZIP_DEFLATED, compresslevel=level) as f:
+            pack_funcs.PackAddonsFromSource.write_member(f, source, Path("data.txt"))
+        with ZipFile(tmp_path / f"level{level}.zip") as f:
+            sizes.append(f.getinfo("data.txt").compress_size)
+
+    assert sizes[0] > sizes[1]
@@ -0,0 +1,48 @@
+"""Test the performance ledger and regression detection."""
+
+from bpydevutil.functions import perf_funcs
+
+
+def test_ledger(tmp_path):
+    ledger = perf_funcs.PerfLedger(tmp_path / "perf" / "perf.jsonl")
+    assert ledger.read() == []
+
+    recorder = perf_funcs.PerfRecorder("install", tmp_path)
+    with recorder.phase("scan"):
+        pass
+    with recorder.phase("scan"):
+        pass
+    recorder.addons, recorder.files, recorder.bytes = 2, 10, 1000
+    ledger.append(recorder.to_record())
+
+    with open(ledger.path, "a") as f:
+        f.write("not json\n")
+
+    (record,) = ledger.read()
+    assert record["command"] == "install"
+    assert record["src"] == str(tmp_path.resolve())
+    assert list(record["phases"]) == ["scan"]
+    assert (record["addons"], record["files"], record["bytes"]) == (2, 10, 1000)
+
+
+def test_analyze(tmp_path):
+    durations = [1.0, 1.1, 0.9, 1.0, 1.5, 1.0]
+    records = [{"command": "pack", "src": "src", "duration": d, "phases": {"pack": d}} for d in durations]
+    records.insert(3, {"command": "install", "src": "src", "duration": 5.0})
+
+    reports = perf_funcs.analyze(records, window=3, threshold=0.25)
+    pack_reports = [report for report in reports if report.record["command"] == "pack"]
+
+    assert all(report.baseline is None for report in pack_reports[:3])
+    assert pack_reports[3].baseline == 1.0 and not pack_reports[3].regression
+    assert pack_reports[4].regression
+    assert not pack_reports[5].regression
+    assert reports[3].baseline is None
+
+    metrics = tmp_path / "bpydevutil.prom"
+    perf_funcs.write_openmetrics(reports, metrics)
+    text = metrics.read_text()
+    assert 'bpydevutil_run_duration_seconds{command="pack",src="src"} 1.0' in text
+    assert 'bpydevutil_phase_duration_seconds{command="pack",src="src",phase="pack"} 1.0' in text
+    assert "bpydevutil_run_baseline_seconds" in text
+    assert text.endswith("# EOF\n")
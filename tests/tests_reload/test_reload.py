@@ -0,0 +1,53 @@
+"""Test selective module reloading."""
+
+from bpydevutil.functions import reload_funcs
+
+
+def _write_addon(root_dir):
+    addon = root_dir / "graph_addon"
+    (addon / "ops").mkdir(parents=True)
+    (addon / "__init__.py").write_text("bl_info = {}\nfrom . import ops, prefs\n")
+    (addon / "prefs.py").write_text("import bpy\n")
+    (addon / "utils.py").write_text("import os\n")
+    (addon / "ops" / "__init__.py").write_text("from .export import ExportOp\n")
+    (addon / "ops" / "export.py").write_text("from ..utils import helper\nfrom graph_addon import prefs\n")
+    return addon
+
+
+def test_build_import_graph(tmp_path):
+    addon = _write_addon(tmp_path)
+    graph = reload_funcs.build_import_graph(addon)
+
+    assert graph["graph_addon"] == {"graph_addon.ops", "graph_addon.prefs"}
+    assert graph["graph_addon.ops"] == {"graph_addon.ops.export"}
+    assert graph["graph_addon.ops.export"] == {"graph_addon.utils", "graph_addon.prefs"}
+    assert graph["graph_addon.utils"] == set()
+
+
+def test_get_modules_to_reload(tmp_path):
+    graph = reload_funcs.build_import_graph(_write_addon(tmp_path))
+
+    order = reload_funcs.get_modules_to_reload(graph, {"graph_addon.utils"})
+    assert order == ["graph_addon.utils", "graph_addon.ops.export", "graph_addon.ops", "graph_addon"]
+
+    order = reload_funcs.get_modules_to_reload(graph, {"graph_addon.prefs"})
+    assert "graph_addon.utils" not in order
+    assert order.index("graph_addon.prefs") < order.index("graph_addon.ops.export") < order.index("graph_addon")
+
+
+def test_cycles_are_broken():
+    graph = {"a": {"b"}, "b": {"a"}, "c": {"a"}}
+    assert reload_funcs.get_modules_to_reload(graph, {"a"}) == ["a", "b", "c"]
+
+
+def test_plan_reload(tmp_path):
+    addon = _write_addon(tmp_path)
+    stray = tmp_path / "notes.txt"
+
+    modules, addons, unmatched = reload_funcs.plan_reload([addon], [addon / "prefs.py", stray])
+    assert addons == ["graph_addon"]
+    assert modules[0] == "graph_addon.prefs"
+    assert unmatched == [stray.resolve()]
+
+    script = reload_funcs.build_reload_script(modules, addons)
+    compile(script, "<reload>", "exec")
@@ -0,0 +1,114 @@
+"""Test the pooled test runner."""
+
+import sys
+import threading
+from pathlib import Path
+from xml.etree import ElementTree
+
+import pytest
+
+from bpydevutil.functions import runner_funcs
+
+
+def example_tests(tests_dir):
+    """Create test modules with passing, failing, skipped and broken tests."""
+    tests_dir.mkdir()
+    (tests_dir / "test_passing.py").write_text(
+        "import unittest\nimport my_addon\n\n"
+        "class TestAddon(unittest.TestCase):\n"
+        "    def test_value(self):\n        print('noise')\n        self.assertEqual(my_addon.VALUE, 1)\n\n"
+        "    @unittest.skip('not today')\n    def test_skipped(self):\n        pass\n"
+    )
+    (tests_dir / "test_failing.py").write_text(
+        "import unittest\n\nclass TestFail(unittest.TestCase):\n    def test_fail(self):\n        self.fail('boom')\n"
+    )
+    (tests_dir / "test_broken.py").write_text("raise ImportError('missing dependency')\n")
+
+
+def test_worker_pool(tmp_path):
+    src_dir = tmp_path / "src"
+    src_dir.mkdir()
+    (src_dir / "my_addon.py").write_text("bl_info = {}\nVALUE = 1\n")
+    tests_dir = tmp_path / "tests"
+    example_tests(tests_dir)
+
+    modules = runner_funcs.discover_test_modules(tests_dir)
+    assert [module.name for module in modules] == ["test_broken.py", "test_failing.py", "test_passing.py"]
+
+    pool = runner_funcs.TestWorkerPool(runner_funcs.build_worker_command(python_exe=sys.executable), 2, [src_dir])
+    results = pool.run(modules)
+
+    broken, failing, passing = results
+    assert broken.count("error") == 1
+    assert failing.count("failed") == 1 and "boom" in failing.cases[0].message
+    assert passing.count("passed") == 1 and passing.count("skipped") == 1
+    assert "noise" in passing.output
+
+    durations_file = tmp_path / "durations.json"
+    runner_funcs.save_durations(durations_file, results, {})
+    durations = runner_funcs.load_durations(durations_file)
+    assert set(durations) == {str(module) for module in modules}
+
+    report = tmp_path / "report.xml"
+    runner_funcs.write_junit_xml(results, report)
+    root = ElementTree.parse(report).getroot()
+    assert (root.get("tests"), root.get("failures"), root.get("errors"), root.get("skipped")) == ("4", "1", "1", "1")
+
+
+def test_tests_cannot_read_protocol(tmp_path):
+    tests_dir = tmp_path / "tests"
+    tests_dir.mkdir()
+    (tests_dir / "test_input.py").write_text(
+        "import os\nimport sys\nimport unittest\n\n"
+        "class TestInput(unittest.TestCase):\n"
+        "    def test_input(self):\n        input()\n\n"
+        "    def test_stdin_fd(self):\n        self.assertEqual(os.read(0, 1), b'')\n\n"
+        "    def test_stdout_fd(self):\n        os.write(1, b'@@bpydevutil@@ not json\\n')\n"
+    )
+    (tests_dir / "test_after.py").write_text(
+        "import unittest\n\nclass TestAfter(unittest.TestCase):\n    def test_ok(self):\n        pass\n"
+    )
+
+    pool = runner_funcs.TestWorkerPool(runner_funcs.build_worker_command(python_exe=sys.executable), 1, [])
+    modules = runner_funcs.discover_test_modules(tests_dir)
+    results = []
+    thread = threading.Thread(target=lambda: results.extend(pool.run(modules)), daemon=True)
+    thread.start()
+    thread.join(30)
+
+    assert not thread.is_alive(), "A test reading stdin blocked the worker."
+    after, input_module = results
+    assert after.count("passed") == 1
+    statuses = {case.name: case.status for case in input_module.cases}
+    assert statuses == {"test_input": "error", "test_stdin_fd": "passed", "test_stdout_fd": "passed"}
+
+
+def test_timeout_and_startup_errors(tmp_path):
+    tests_dir = tmp_path / "tests"
+    tests_dir.mkdir()
+    (tests_dir / "test_hang.py").write_text(
+        "import time\nimport unittest\n\nclass TestHang(unittest.TestCase):\n"
+        "    def test_hang(self):\n        time.sleep(60)\n"
+    )
+    (tests_dir / "test_quick.py").write_text(
+        "import unittest\n\nclass TestQuick(unittest.TestCase):\n    def test_ok(self):\n        pass\n"
+    )
+
+    command = runner_funcs.build_worker_command(python_exe=sys.executable)
+    pool = runner_funcs.TestWorkerPool(command, 1, [], timeout=2)
+    modules = runner_funcs.discover_test_modules(tests_dir)
+    results = pool.run(modules, {str(modules[0]): 10.0, str(modules[1]): 1.0})
+
+    hang, quick = results
+    assert hang.count("error") == 1 and "did not finish" in hang.cases[0].message
+    assert quick.count("passed") == 1
+
+    broken_command = [sys.executable, "-c", "import sys; sys.stderr.write('cannot start here'); sys.exit(1)"]
+    with pytest.raises(RuntimeError, match="cannot start here"):
+        runner_funcs.TestWorkerPool(broken_command, 1, [], timeout=10).run(modules)
+
+
+def test_schedule():
+    durations = {"a": 1.0, "b": 5.0}
+    order = runner_funcs.schedule([Path(name) for name in ("a", "b", "c")], durations)
+    assert [str(module) for module in order] == ["c", "b", "a"]
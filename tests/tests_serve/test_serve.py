@@ -0,0 +1,110 @@
+"""Test the addon index daemon."""
+
+import json
+import os
+import socketserver
+import stat
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from bpydevutil.functions import common_funcs, serve_funcs
+
+pytestmark = pytest.mark.skipif(not serve_funcs.daemon_supported(), reason="Requires unix domain sockets.")
+
+
+class TestAddonIndexServer:
+    """Testing AddonIndexServer and DaemonClient."""
+
+    @pytest.fixture(scope="class")
+    def _setup(self, temp_projects_dir, tmp_path_factory):
+        """Class fixture."""
+
+        root_dir, modules, packages = temp_projects_dir
+        socket_path = tmp_path_factory.mktemp("daemon") / "bpy.sock"
+
+        server = serve_funcs.AddonIndexServer(socket_path, poll_interval=0.05)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+
+        client = serve_funcs.DaemonClient(socket_path)
+        for _ in range(100):
+            if client.ping():
+                break
+            time.sleep(0.01)
+
+        assert stat.S_IMODE(os.stat(socket_path).st_mode) == 0o600
+        yield client, root_dir / "src", modules, packages
+
+        server.shutdown()
+        thread.join()
+
+    def test_get_addon_srcs(self, _setup):
+        client, src_dir, _, _ = _setup
+
+        daemon_names = sorted(path.name for path in client.get_addon_srcs(src_dir))
+        direct_names = sorted(path.name for path in common_funcs.get_addon_srcs(src_dir))
+        assert daemon_names == direct_names
+
+        excluded = client.get_addon_srcs(src_dir, ["valid_package"])
+        assert "valid_package" not in [path.name for path in excluded]
+
+    def test_get_addon_data(self, _setup):
+        client, src_dir, _, _ = _setup
+
+        bl_info = client.get_addon_data(src_dir / "valid_package")
+        assert bl_info["version"] == (0, 2, 5)
+
+    def test_index_tracks_changes(self, _setup):
+        client, src_dir, _, _ = _setup
+
+        new_module = src_dir / "daemon_module.py"
+        new_module.write_text('bl_info = {"name": "Daemon", "version": (1, 0, 0)}')
+        assert "daemon_module.py" in [path.name for path in client.get_addon_srcs(src_dir)]
+
+        new_module.unlink()
+        assert "daemon_module.py" not in [path.name for path in client.get_addon_srcs(src_dir)]
+
+
+def test_fallback_without_daemon(temp_projects_dir, tmp_path):
+    root_dir, _, _ = temp_projects_dir
+    socket_path = tmp_path / "missing.sock"
+
+    assert serve_funcs.DaemonClient(socket_path).get_addon_srcs(root_dir / "src") is None
+    assert serve_funcs.get_addon_srcs(root_dir / "src", socket_path=socket_path)
+
+
+@pytest.mark.parametrize(
+    "response",
+    [{"ok": True, "addons": ["valid_module.py", "../../victim"]}, {"ok": True}, {"ok": True, "addons": "victim"}],
+)
+def test_rejects_invalid_answers(temp_projects_dir, tmp_path, response):
+    root_dir, _, _ = temp_projects_dir
+    socket_path = tmp_path / "fake.sock"
+
+    class FakeDaemon(socketserver.StreamRequestHandler):
+        def handle(self):
+            self.rfile.readline()
+            self.wfile.write(json.dumps(response).encode() + b"\n")
+
+    server = socketserver.UnixStreamServer(str(socket_path), FakeDaemon)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        assert serve_funcs.DaemonClient(socket_path).get_addon_srcs(root_dir / "src") is None
+        assert "victim" not in [
+            path.name for path in serve_funcs.get_addon_srcs(root_dir / "src", socket_path=socket_path)
+        ]
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_default_socket_path(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+    assert serve_funcs.default_socket_path() == tmp_path / "bpydevutil" / "daemon.sock"
+
+    monkeypatch.delenv("XDG_RUNTIME_DIR")
+    assert serve_funcs.default_socket_path().parent == Path.home() / ".cache" / "bpydevutil"
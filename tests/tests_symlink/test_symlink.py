@@ -40,3 +40,44 @@ class TestSymlinkToAddonSource:
         for package, is_valid in packages.items():
             if is_valid:
                 assert package in symlinks
+
+
+def test_reconcile(temp_projects_dir, tmp_path):
+    root_dir, _, _ = temp_projects_dir
+    src_dir = root_dir / "src"
+    addons = [src_dir / "valid_module.py", src_dir / "valid_package"]
+
+    instance = symlink_funcs.SymlinkToAddonSource(tmp_path)
+    (tmp_path / "valid_package").mkdir()
+    (tmp_path / "removed_addon").symlink_to(tmp_path / "missing_source")
+
+    result = instance.reconcile(addons)
+    assert result.created == ["valid_module.py"]
+    assert result.replaced == ["valid_package"]
+    assert (tmp_path / "valid_package").resolve() == addons[1].resolve()
+
+    result = instance.reconcile(addons, prune=True)
+    assert sorted(result.unchanged) == ["valid_module.py", "valid_package"]
+    assert not result.created and not result.replaced
+    assert result.pruned == ["removed_addon"]
+    assert not (tmp_path / "removed_addon").is_symlink()
+
+
+def test_reconcile_other_form(tmp_path):
+    src_dir = tmp_path / "src"
+    src_dir.mkdir()
+    (src_dir / "foo.py").write_text('bl_info = {"name": "Foo"}')
+    (src_dir / "bar").mkdir()
+    (src_dir / "bar" / "__init__.py").write_text('bl_info = {"name": "Bar"}')
+
+    addons_dir = tmp_path / "addons"
+    (addons_dir / "foo").mkdir(parents=True)
+    (addons_dir / "foo" / "user_data.txt").write_text("keep me")
+    (addons_dir / "bar.py").symlink_to(tmp_path / "old_bar.py")
+
+    result = symlink_funcs.SymlinkToAddonSource(addons_dir).reconcile([src_dir / "foo.py", src_dir / "bar"])
+    assert sorted(result.created) == ["bar", "foo.py"]
+    assert result.removed == ["bar.py"]
+    assert result.conflicts == ["foo"]
+    assert (addons_dir / "foo" / "user_data.txt").read_text() == "keep me"
+    assert not (addons_dir / "bar.py").is_symlink()
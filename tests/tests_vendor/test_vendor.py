@@ -0,0 +1,121 @@
+"""Test vendoring wheels into addons."""
+
+import stat
+from pathlib import PurePosixPath
+from zipfile import ZipFile
+
+import pytest
+
+from bpydevutil.functions import pack_funcs, vendor_funcs
+
+
+def example_wheel(wheelhouse, name, version):
+    """Build a minimal wheel file."""
+    wheel = wheelhouse / f"{name}-{version}-py3-none-any.whl"
+    with ZipFile(wheel, "w") as f:
+        f.writestr(f"{name}/__init__.py", f"__version__ = '{version}'")
+        f.writestr(f"{name}-{version}.dist-info/METADATA", f"Name: {name}")
+        f.writestr(f"{name}-{version}.data/scripts/tool", "#!/bin/sh")
+    return wheel
+
+
+class TestVendorWheels:
+    """Testing VendorWheels."""
+
+    @pytest.fixture()
+    def _setup(self, tmp_path):
+        """Test fixture."""
+
+        wheelhouse = tmp_path / "wheels"
+        wheelhouse.mkdir()
+        example_wheel(wheelhouse, "fancy_lib", "1.2.0")
+        example_wheel(wheelhouse, "fancy_lib", "1.10.0")
+
+        config = {"wheelhouse": "wheels", "cache-dir": "cache", "addons": {"my_addon": ["Fancy-Lib"]}}
+        return vendor_funcs.VendorWheels.from_config(config, tmp_path), tmp_path
+
+    def test_find_wheel(self, _setup):
+        instance, _ = _setup
+
+        assert instance.find_wheel("fancy.lib").name == "fancy_lib-1.10.0-py3-none-any.whl"
+        assert instance.find_wheel("fancy_lib==1.2.0").name == "fancy_lib-1.2.0-py3-none-any.whl"
+        with pytest.raises(FileNotFoundError):
+            instance.find_wheel("missing")
+
+    def test_extract_is_cached(self, _setup):
+        instance, tmp_path = _setup
+        wheel = instance.find_wheel("fancy_lib")
+
+        extracted = instance.extract(wheel)
+        marker = extracted / "marker"
+        marker.touch()
+
+        assert instance.extract(wheel) == extracted
+        assert marker.exists()
+        assert len(list((tmp_path / "cache").iterdir())) == 1
+
+    def test_link_into_and_pack(self, _setup):
+        instance, tmp_path = _setup
+        src_dir = tmp_path / "src"
+        addon = src_dir / "my_addon"
+        addon.mkdir(parents=True)
+        (addon / "__init__.py").write_text("bl_info = {}")
+
+        files = instance.get_vendored_files(addon)
+        assert PurePosixPath("libs/fancy_lib/__init__.py") in files
+        assert not any(".data" in path.parts[1] for path in files)
+
+        installed = tmp_path / "installed" / "my_addon"
+        installed.mkdir(parents=True)
+        assert instance.link_into(installed) == len(files)
+        assert (installed / "libs" / "fancy_lib" / "__init__.py").read_text() == "__version__ = '1.10.0'"
+
+        pack_funcs.PackAddonsFromSource(tmp_path).pack_addon(addon, "vendored", src_dir, extra_files=files)
+        with ZipFile(tmp_path / "vendored.zip") as f:
+            assert "my_addon/libs/fancy_lib/__init__.py" in f.namelist()
+
+        module = src_dir / "my_addon.py"
+        module.touch()
+        with pytest.raises(ValueError):
+            instance.get_vendored_files(module)
+
+
+def test_cache_is_not_shared(tmp_path):
+    wheelhouse = tmp_path / "wheels"
+    wheelhouse.mkdir()
+    example_wheel(wheelhouse, "fancy_lib", "1.0.0")
+    requirements = {"my_addon": ["fancy_lib"]}
+
+    copying = vendor_funcs.VendorWheels(wheelhouse, requirements, tmp_path / "cache")
+    installed = tmp_path / "copied" / "my_addon"
+    installed.mkdir(parents=True)
+    copying.link_into(installed)
+
+    cached = next((tmp_path / "cache").rglob("fancy_lib/__init__.py"))
+    copied = installed / "libs" / "fancy_lib" / "__init__.py"
+    assert not stat.S_IMODE(cached.stat().st_mode) & 0o222
+    assert not copied.samefile(cached)
+    copied.write_text("edited")
+    assert cached.read_text() == "__version__ = '1.0.0'"
+
+    linking = vendor_funcs.VendorWheels(wheelhouse, requirements, tmp_path / "cache", hardlink=True)
+    installed = tmp_path / "linked" / "my_addon"
+    installed.mkdir(parents=True)
+    linking.link_into(installed)
+    assert (installed / "libs" / "fancy_lib" / "__init__.py").samefile(cached)
+
+
+def test_incomplete_config(tmp_path):
+    addon = tmp_path / "src" / "my_addon"
+    addon.mkdir(parents=True)
+    other = tmp_path / "src" / "other_addon"
+    other.mkdir()
+
+    instance = vendor_funcs.VendorWheels.from_config({"addons": {"my_addon": ["fancy_lib"]}}, tmp_path)
+    assert instance.get_vendored_files(other) == {}
+    with pytest.raises(ValueError, match="wheelhouse"):
+        instance.get_vendored_files(addon)
+
+    instance = vendor_funcs.VendorWheels.from_config({"wheelhouse": "missing", "addons": {"my_addon": ["x"]}}, tmp_path)
+    with pytest.raises(FileNotFoundError, match="not an existing directory"):
+        instance.get_vendored_files(addon)
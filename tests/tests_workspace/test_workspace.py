@@ -0,0 +1,90 @@
+"""Test workspace discovery and scheduling."""
+
+from bpydevutil import api
+from bpydevutil.functions import workspace_funcs
+
+
+def example_project(root, name, addons, src_dir="src", extra=""):
+    """Create a project with its own config and addon sources."""
+    project = root / name
+    (project / "src").mkdir(parents=True)
+    (project / "pyproject.toml").write_text(
+        f'[tool.bpydevutil]\nsrc-dir = "{src_dir}"\nblender-addons-dir = "../addons"\n{extra}'
+    )
+    for addon in addons:
+        (project / "src" / f"{addon}.py").write_text(f'bl_info = {{"name": "{addon}", "version": (1, 0)}}')
+    return project
+
+
+def test_load_workspace(tmp_path):
+    example_project(tmp_path, "repo_a", ["addon_a"])
+    example_project(tmp_path, "repo_b", ["addon_b"], extra='output-dir = "out"')
+    (tmp_path / "not_a_project").mkdir()
+
+    workspace = {"projects": ["repo_*", "not_a_project", "repo_a"]}
+    projects = workspace_funcs.load_workspace(workspace, tmp_path)
+    assert [project.name for project in projects] == ["repo_a", "repo_b"]
+
+    jobs, skipped = workspace_funcs.build_jobs(projects, "pack")
+    assert [job.label for job in jobs] == ["repo_b"]
+    assert len(skipped) == 1
+
+    jobs, skipped = workspace_funcs.build_jobs(projects, "install")
+    assert not skipped
+    assert jobs[0].target_dir == (tmp_path / "addons").resolve()
+
+
+def test_shared_targets(tmp_path):
+    (tmp_path / "addons").mkdir()
+    example_project(tmp_path, "repo_a", ["addon_a", "shared"])
+    example_project(tmp_path, "repo_b", [], src_dir="../repo_a/src")
+    example_project(tmp_path, "repo_c", ["shared"])
+
+    projects = workspace_funcs.load_workspace({"projects": ["repo_*"]}, tmp_path)
+    jobs, _ = workspace_funcs.build_jobs(projects, "install")
+    repo_a, repo_b, repo_c = api.run_jobs(jobs, max_workers=2)
+
+    assert repo_a.success
+    assert sorted(repo_b.skipped) == ["addon_a.py", "shared.py"]
+    assert not repo_b.addons
+    assert not repo_c.success
+    assert "Conflicts" in repo_c.addons[0].error
+    assert sorted(path.name for path in (tmp_path / "addons").iterdir()) == ["addon_a.py", "shared.py"]
+
+
+def test_shared_pack_targets(tmp_path):
+    (tmp_path / "out").mkdir()
+    extra = 'output-dir = "../out"'
+    example_project(tmp_path, "repo_a", ["addon_a"], extra=extra)
+    example_project(tmp_path, "repo_b", ["addon_a"], extra=extra)
+    example_project(tmp_path, "repo_c", ["addon_c"], extra=extra)
+    # Same module name as repo_a, different release name.
+    (tmp_path / "repo_b" / "src" / "addon_a.py").write_text('bl_info = {"name": "other", "version": (2, 0)}')
+    # Different module name, same release name as repo_a.
+    (tmp_path / "repo_c" / "src" / "addon_c.py").write_text('bl_info = {"name": "addon_a", "version": (1, 0)}')
+
+    projects = workspace_funcs.load_workspace({"projects": ["repo_*"]}, tmp_path)
+    jobs, _ = workspace_funcs.build_jobs(projects, "pack")
+    repo_a, repo_b, repo_c = api.run_jobs(jobs, max_workers=2)
+
+    assert repo_a.success and repo_b.success
+    assert not repo_c.success
+    assert "Conflicts" in repo_c.addons[0].error
+    assert len(list((tmp_path / "out").iterdir())) == 2
+
+
+def test_broken_pack_addon(tmp_path):
+    (tmp_path / "out").mkdir()
+    project = example_project(tmp_path, "repo_a", ["good", "broken", "bad_call"], extra='output-dir = "../out"')
+    (project / "src" / "broken.py").write_text("bl_info = {")
+    (project / "src" / "bad_call.py").write_text('bl_info = {"name": "bad", "version": (1, 0), "x": foo()}')
+
+    projects = workspace_funcs.load_workspace({"projects": ["repo_a"]}, tmp_path)
+    jobs, _ = workspace_funcs.build_jobs(projects, "pack")
+    (result,) = api.run_jobs(jobs)
+
+    addons = {addon.addon: addon for addon in result.addons}
+    assert addons["good.py"].success
+    assert "SyntaxError" in addons["broken.py"].error
+    assert not addons["bad_call.py"].success
+    assert [path.name for path in (tmp_path / "out").iterdir()] == ["good (v1.0).zip"]